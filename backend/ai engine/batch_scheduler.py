@@ -0,0 +1,93 @@
+"""
+Batch Scheduler - Request coalescing for AI Engine pipelines
+Collects items submitted concurrently from async handlers and runs them as a single batch
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional
+from concurrent.futures import Executor
+
+logger = logging.getLogger(__name__)
+
+class BatchScheduler:
+    """
+    Coalesces concurrent single-item requests into batched pipeline calls
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 16,
+                 max_wait_ms: float = 20, executor: Optional[Executor] = None):
+        """
+        Initialize batch scheduler
+
+        Args:
+            batch_fn: Blocking callable mapping a list of items to a list of results (same order)
+            max_batch_size: Maximum number of items submitted in one batch
+            max_wait_ms: How long to wait for more items after the first one arrives
+            executor: Executor used to run batch_fn (default: the event loop's default executor)
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.executor = executor
+
+        self._loop = None
+        self._queue = None
+        self._worker = None
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Submit a single item and wait for its result
+
+        Args:
+            item: Item to process as part of the next batch
+
+        Returns:
+            Result produced by batch_fn for this item
+        """
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    def _ensure_worker(self):
+        """Start the background batching task on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _run(self):
+        """Drain the queue, grouping items that arrive within the wait window"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000.0
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            items = [item for item, _ in batch]
+            try:
+                results = list(await loop.run_in_executor(self.executor, self.batch_fn, items))
+                # A short result list would leave the callers of the missing items awaiting forever
+                if len(results) != len(batch):
+                    raise RuntimeError(f"Batch function returned {len(results)} results for {len(items)} items")
+            except Exception as e:
+                logger.error(f"Batch of {len(items)} items failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
@@ -5,27 +5,196 @@ Enhanced entity recognition for legal and compliance documents
 
 import spacy
 from spacy import displacy
-from spacy.tokens import Doc, Span
+from spacy.language import Language
+from spacy.tokens import Doc
 from spacy.matcher import Matcher, PhraseMatcher
+import os
 import re
-from typing import List, Dict, Any, Optional, Tuple
+import sys
+import json
+import functools
+from typing import List, Dict, Any, Optional, Iterable
 import logging
 
+try:
+    from .keyword_matching import build_keyword_automaton, find_keywords
+except ImportError:
+    from keyword_matching import build_keyword_automaton, find_keywords
+
 logger = logging.getLogger(__name__)
 
+# Default number of texts buffered per nlp.pipe batch; overridable via the environment
+DEFAULT_BATCH_SIZE = int(os.getenv("DEVSECOPS_SPACY_BATCH_SIZE", "64"))
+
+# Pipeline components whose annotations (POS tags, lemmas) are never read.
+# NER, the entity ruler and the parser (sentence boundaries, dependency view) stay enabled.
+UNUSED_COMPONENTS = ("tagger", "attribute_ruler", "lemmatizer")
+
+# Regex patterns for compliance entities, compiled once at import. Email parts are length-bounded
+# (RFC 5321 limits) so a long run without a valid address cannot backtrack quadratically, and URL
+# characters are one class rather than an alternation of overlapping classes.
+COMPLIANCE_PATTERNS = {
+    entity_type: re.compile(pattern) for entity_type, pattern in {
+        "email": r'\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Z|a-z]{2,63}\b',
+        "url": r'https?://[$-_@.&+a-zA-Z0-9!*\\(),]+',
+        "phone": r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b',
+        "ssn": r'\b\d{3}-?\d{2}-?\d{4}\b',
+        "credit_card": r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b',
+        "ip_address": r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b',
+        "date": r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b'
+    }.items()
+}
+
+# Keywords indicating each legal document section
+LEGAL_KEYWORDS = {
+    "contract": ("agreement", "contract", "terms", "conditions"),
+    "privacy": ("privacy", "data", "personal", "information"),
+    "liability": ("liability", "responsible", "damages", "indemnify"),
+    "termination": ("terminate", "end", "expire", "cancel"),
+    "governing_law": ("governed", "jurisdiction", "applicable", "law")
+}
+_ALL_LEGAL_KEYWORDS = frozenset(keyword for keywords in LEGAL_KEYWORDS.values() for keyword in keywords)
+_LEGAL_KEYWORD_AUTOMATON = build_keyword_automaton(_ALL_LEGAL_KEYWORDS)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_nlp(model_name: str, use_gpu: bool = False):
+    """
+    Load a spaCy model with the legal entity ruler, once per process
+    
+    Extractors share the returned pipeline; per-instance matchers are built on its vocab.
+    """
+    # GPU allocation must be selected before the model is loaded
+    if use_gpu:
+        if spacy.prefer_gpu():
+            logger.info("spaCy is using the GPU")
+        else:
+            logger.warning("GPU requested for spaCy but none is available, using CPU")
+    
+    try:
+        logger.info(f"Loading spaCy model: {model_name}")
+        nlp = spacy.load(model_name)
+    except OSError as e:
+        logger.error(f"Failed to load spaCy model {model_name}: {e}")
+        logger.info("Trying to download the model...")
+        try:
+            spacy.cli.download(model_name)
+            nlp = spacy.load(model_name)
+        except Exception as download_error:
+            logger.error(f"Failed to download/load model: {download_error}")
+            raise
+    
+    _disable_unused_components(nlp)
+    _add_legal_entity_ruler(nlp)
+    
+    if "transformer" in nlp.pipe_names:
+        # Transformer-backed models (e.g. en_core_web_trf) only gain from GPU batching with mixed precision
+        if use_gpu:
+            try:
+                nlp.get_pipe("transformer").model.attrs["mixed_precision"] = True
+            except Exception as e:
+                logger.warning(f"Could not enable mixed precision for spaCy transformer: {e}")
+        
+        # Drop transformer outputs once every component has consumed them
+        nlp.add_pipe("release_trf_data", last=True)
+    
+    return nlp
+
+
+@functools.lru_cache(maxsize=8)
+def _build_legal_matcher(model_name: str, use_gpu: bool, patterns_key: str) -> Matcher:
+    """
+    Compile the legal pattern Matcher once per process for a model and pattern set
+    
+    patterns_key is the JSON of the patterns (in insertion order, which sets match order),
+    so changed patterns get a new matcher.
+    """
+    matcher = Matcher(_load_nlp(model_name, use_gpu).vocab)
+    for pattern_type, patterns in json.loads(patterns_key).items():
+        for i, pattern in enumerate(patterns):
+            matcher.add(f"{pattern_type.upper()}_{i}", [pattern])
+    return matcher
+
+
+@Language.component("release_trf_data")
+def _release_trf_data(doc: Doc) -> Doc:
+    """Clear the transformer output kept on each Doc, which otherwise pins (GPU) memory per document"""
+    if Doc.has_extension("trf_data"):
+        doc._.trf_data = None
+    return doc
+
+
+def _disable_unused_components(nlp):
+    """Disable pipeline components whose output is not used by the extractor"""
+    for name in UNUSED_COMPONENTS:
+        if name in nlp.pipe_names:
+            nlp.disable_pipe(name)
+    logger.info(f"Active spaCy components: {nlp.pipe_names}")
+
+
+def _add_legal_entity_ruler(nlp):
+    """Add custom entity ruler for legal entities"""
+    # Multi-word literals are phrase patterns, matched case-insensitively by the
+    # ruler's PhraseMatcher; regulator acronyms stay case-sensitive token patterns
+    legal_entities = [
+        # Court types
+        {"label": "COURT", "pattern": "supreme court"},
+        {"label": "COURT", "pattern": "district court"},
+        {"label": "COURT", "pattern": "appellate court"},
+        {"label": "COURT", "pattern": "federal court"},
+        
+        # Legal documents
+        {"label": "LEGAL_DOC", "pattern": "terms of service"},
+        {"label": "LEGAL_DOC", "pattern": "privacy policy"},
+        {"label": "LEGAL_DOC", "pattern": "user agreement"},
+        {"label": "LEGAL_DOC", "pattern": "license agreement"},
+        
+        # Regulatory bodies
+        {"label": "REGULATOR", "pattern": [{"ORTH": "SEC"}]},
+        {"label": "REGULATOR", "pattern": [{"ORTH": "FTC"}]},
+        {"label": "REGULATOR", "pattern": [{"ORTH": "FDA"}]},
+        {"label": "REGULATOR", "pattern": [{"ORTH": "GDPR"}]},
+        {"label": "REGULATOR", "pattern": [{"ORTH": "CCPA"}]},
+        
+        # Legal concepts
+        {"label": "LEGAL_CONCEPT", "pattern": "intellectual property"},
+        {"label": "LEGAL_CONCEPT", "pattern": "data protection"},
+        {"label": "LEGAL_CONCEPT", "pattern": "breach notification"},
+        {"label": "LEGAL_CONCEPT", "pattern": "right to deletion"},
+    ]
+    
+    ruler = nlp.add_pipe(
+        "entity_ruler", before="ner", config={"overwrite_ents": True, "phrase_matcher_attr": "LOWER"}
+    )
+    ruler.add_patterns(legal_entities)
+
+
 class LegalEntityExtractor:
     """
     Enhanced entity extractor for legal documents using spaCy
     """
     
-    def __init__(self, model_name: str = "en_core_web_sm"):
+    def __init__(self, model_name: str = "en_core_web_sm", batch_size: Optional[int] = None, n_process: int = 1,
+                 use_gpu: bool = False):
         """
         Initialize spaCy pipeline with legal enhancements
         
         Args:
             model_name: spaCy model to use
+            batch_size: Texts per nlp.pipe batch (default: DEVSECOPS_SPACY_BATCH_SIZE or 64)
+            n_process: Worker processes used by nlp.pipe for batched extraction
+            use_gpu: Run the spaCy pipeline on the GPU when one is available (for transformer models)
         """
         self.model_name = model_name
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+        self.n_process = n_process
+        self.use_gpu = use_gpu
+        
+        if n_process > 1 and sys.platform == "win32":
+            logger.warning(
+                "spaCy multiprocessing on Windows spawns fresh interpreters that reload the model; "
+                "n_process > 1 is usually slower than a single process there"
+            )
         self.nlp = None
         self.matcher = None
         self.phrase_matcher = None
@@ -38,80 +207,21 @@ class LegalEntityExtractor:
     
     def _load_spacy_pipeline(self):
         """Load and configure spaCy pipeline"""
-        try:
-            logger.info(f"Loading spaCy model: {self.model_name}")
-            self.nlp = spacy.load(self.model_name)
-            
-            # Add custom legal component
-            if "legal_entity_ruler" not in self.nlp.pipe_names:
-                self._add_legal_entity_ruler()
-            
-            # Initialize matchers
-            self.matcher = Matcher(self.nlp.vocab)
-            self.phrase_matcher = PhraseMatcher(self.nlp.vocab)
-            
-            # Add legal patterns
-            self._add_legal_patterns()
-            
-            logger.info("spaCy pipeline loaded successfully with legal enhancements")
-            
-        except OSError as e:
-            logger.error(f"Failed to load spaCy model {self.model_name}: {e}")
-            logger.info("Trying to download the model...")
-            try:
-                spacy.cli.download(self.model_name)
-                self.nlp = spacy.load(self.model_name)
-                self._add_legal_entity_ruler()
-                self.matcher = Matcher(self.nlp.vocab)
-                self.phrase_matcher = PhraseMatcher(self.nlp.vocab)
-                self._add_legal_patterns()
-            except Exception as download_error:
-                logger.error(f"Failed to download/load model: {download_error}")
-                raise
-    
-    def _add_legal_entity_ruler(self):
-        """Add custom entity ruler for legal entities"""
-        from spacy.pipeline import EntityRuler
+        self.nlp = _load_nlp(self.model_name, self.use_gpu)
         
-        ruler = EntityRuler(self.nlp, overwrite_ents=True)
+        # Initialize matchers; the legal pattern matcher is shared by extractors with the same patterns
+        self.matcher = _build_legal_matcher(
+            self.model_name, self.use_gpu, json.dumps(self.legal_patterns)
+        )
+        self.phrase_matcher = PhraseMatcher(self.nlp.vocab)
         
-        # Legal entity patterns
-        legal_entities = [
-            # Court types
-            {"label": "COURT", "pattern": [{"LOWER": "supreme"}, {"LOWER": "court"}]},
-            {"label": "COURT", "pattern": [{"LOWER": "district"}, {"LOWER": "court"}]},
-            {"label": "COURT", "pattern": [{"LOWER": "appellate"}, {"LOWER": "court"}]},
-            {"label": "COURT", "pattern": [{"LOWER": "federal"}, {"LOWER": "court"}]},
-            
-            # Legal documents
-            {"label": "LEGAL_DOC", "pattern": [{"LOWER": "terms"}, {"LOWER": "of"}, {"LOWER": "service"}]},
-            {"label": "LEGAL_DOC", "pattern": [{"LOWER": "privacy"}, {"LOWER": "policy"}]},
-            {"label": "LEGAL_DOC", "pattern": [{"LOWER": "user"}, {"LOWER": "agreement"}]},
-            {"label": "LEGAL_DOC", "pattern": [{"LOWER": "license"}, {"LOWER": "agreement"}]},
-            
-            # Regulatory bodies
-            {"label": "REGULATOR", "pattern": [{"UPPER": "SEC"}]},
-            {"label": "REGULATOR", "pattern": [{"UPPER": "FTC"}]},
-            {"label": "REGULATOR", "pattern": [{"UPPER": "FDA"}]},
-            {"label": "REGULATOR", "pattern": [{"UPPER": "GDPR"}]},
-            {"label": "REGULATOR", "pattern": [{"UPPER": "CCPA"}]},
-            
-            # Legal concepts
-            {"label": "LEGAL_CONCEPT", "pattern": [{"LOWER": "intellectual"}, {"LOWER": "property"}]},
-            {"label": "LEGAL_CONCEPT", "pattern": [{"LOWER": "data"}, {"LOWER": "protection"}]},
-            {"label": "LEGAL_CONCEPT", "pattern": [{"LOWER": "breach"}, {"LOWER": "notification"}]},
-            {"label": "LEGAL_CONCEPT", "pattern": [{"LOWER": "right"}, {"LOWER": "to"}, {"LOWER": "deletion"}]},
-        ]
-        
-        ruler.add_patterns(legal_entities)
-        self.nlp.add_pipe("entity_ruler", before="ner", config={"overwrite_ents": True})
-        self.nlp.get_pipe("entity_ruler").add_patterns(legal_entities)
+        logger.info("spaCy pipeline loaded successfully with legal enhancements")
     
     def _create_legal_patterns(self) -> Dict[str, List[List[Dict]]]:
         """Create legal-specific patterns for matching"""
         return {
             "obligations": [
-                [{"LOWER": {"IN": ["must", "shall", "required"}}],
+                [{"LOWER": {"IN": ["must", "shall", "required"]}}],
                 [{"LOWER": "subject"}, {"LOWER": "to"}],
                 [{"LOWER": "in"}, {"LOWER": "accordance"}, {"LOWER": "with"}],
                 [{"LOWER": "comply"}, {"LOWER": "with"}],
@@ -137,12 +247,6 @@ class LegalEntityExtractor:
             ]
         }
     
-    def _add_legal_patterns(self):
-        """Add legal patterns to matchers"""
-        for pattern_type, patterns in self.legal_patterns.items():
-            for i, pattern in enumerate(patterns):
-                self.matcher.add(f"{pattern_type.upper()}_{i}", [pattern])
-    
     def extract_entities(self, text: str) -> Dict[str, Any]:
         """
         Extract entities from legal text using enhanced spaCy pipeline
@@ -157,6 +261,49 @@ class LegalEntityExtractor:
             # Process text with spaCy
             doc = self.nlp(text)
             
+            return self._build_entity_results(doc, text)
+            
+        except Exception as e:
+            logger.error(f"Entity extraction failed: {e}")
+            return {
+                "entities": [],
+                "legal_patterns": {},
+                "compliance_entities": [],
+                "error": str(e)
+            }
+    
+    def extract_entities_batch(self, texts: Iterable[str], batch_size: Optional[int] = None,
+                               n_process: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Extract entities from several legal texts using spaCy's batched nlp.pipe
+        
+        Args:
+            texts: Input legal texts
+            batch_size: Number of texts buffered per spaCy batch (default: instance setting)
+            n_process: Worker processes for nlp.pipe (default: instance setting)
+            
+        Returns:
+            Extracted entities and analysis for each text, in input order
+        """
+        texts = list(texts)
+        try:
+            docs = self.nlp.pipe(
+                texts,
+                batch_size=batch_size or self.batch_size,
+                n_process=n_process or self.n_process
+            )
+            return [self._build_entity_results(doc, text) for doc, text in zip(docs, texts)]
+        except Exception as e:
+            logger.warning(f"Batched entity extraction failed, extracting texts individually: {e}")
+            return [self.extract_entities(text) for text in texts]
+    
+    def _build_entity_results(self, doc: Doc, text: Optional[str] = None) -> Dict[str, Any]:
+        """Build entity extraction results for a processed document and its source text"""
+        try:
+            # The input string equals doc.text; reuse it instead of rebuilding it from tokens
+            if text is None:
+                text = doc.text
+            
             # Extract standard entities
             entities = []
             for ent in doc.ents:
@@ -173,14 +320,14 @@ class LegalEntityExtractor:
             legal_matches = self._extract_legal_patterns(doc)
             
             # Extract compliance-specific entities
-            compliance_entities = self._extract_compliance_entities(doc)
+            compliance_entities = self._extract_compliance_entities(doc, text)
             
             return {
                 "entities": entities,
                 "legal_patterns": legal_matches,
                 "compliance_entities": compliance_entities,
                 "document_stats": self._get_document_stats(doc),
-                "legal_analysis": self._analyze_legal_structure(doc)
+                "legal_analysis": self._analyze_legal_structure(doc, text)
             }
             
         except Exception as e:
@@ -213,31 +360,21 @@ class LegalEntityExtractor:
         
         return pattern_matches
     
-    def _extract_compliance_entities(self, doc: Doc) -> List[Dict[str, Any]]:
+    def _extract_compliance_entities(self, doc: Doc, text: Optional[str] = None) -> List[Dict[str, Any]]:
         """Extract compliance-specific entities"""
         compliance_entities = []
         
-        # Regex patterns for compliance entities
-        compliance_patterns = {
-            "email": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            "url": r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+',
-            "phone": r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b',
-            "ssn": r'\b\d{3}-?\d{2}-?\d{4}\b',
-            "credit_card": r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b',
-            "ip_address": r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b',
-            "date": r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b'
-        }
-        
-        text = doc.text
-        for entity_type, pattern in compliance_patterns.items():
-            matches = re.finditer(pattern, text)
-            for match in matches:
+        if text is None:
+            text = doc.text
+        for entity_type, pattern in COMPLIANCE_PATTERNS.items():
+            privacy_risk = self._assess_privacy_risk(entity_type)
+            for match in pattern.finditer(text):
                 compliance_entities.append({
                     "text": match.group(),
                     "type": entity_type,
                     "start": match.start(),
                     "end": match.end(),
-                    "privacy_risk": self._assess_privacy_risk(entity_type)
+                    "privacy_risk": privacy_risk
                 })
         
         return compliance_entities
@@ -256,28 +393,23 @@ class LegalEntityExtractor:
     
     def _get_document_stats(self, doc: Doc) -> Dict[str, Any]:
         """Get document statistics"""
+        token_count = len(doc)
+        sentence_count = sum(1 for _ in doc.sents)
         return {
-            "token_count": len(doc),
-            "sentence_count": len(list(doc.sents)),
+            "token_count": token_count,
+            "sentence_count": sentence_count,
             "entity_count": len(doc.ents),
-            "avg_sentence_length": len(doc) / len(list(doc.sents)) if len(list(doc.sents)) > 0 else 0
+            "avg_sentence_length": token_count / sentence_count if sentence_count > 0 else 0
         }
     
-    def _analyze_legal_structure(self, doc: Doc) -> Dict[str, Any]:
+    def _analyze_legal_structure(self, doc: Doc, text: Optional[str] = None) -> Dict[str, Any]:
         """Analyze legal document structure"""
-        legal_keywords = {
-            "contract": ["agreement", "contract", "terms", "conditions"],
-            "privacy": ["privacy", "data", "personal", "information"],
-            "liability": ["liability", "responsible", "damages", "indemnify"],
-            "termination": ["terminate", "end", "expire", "cancel"],
-            "governing_law": ["governed", "jurisdiction", "applicable", "law"]
-        }
-        
-        text_lower = doc.text.lower()
+        text_lower = (doc.text if text is None else text).lower()
+        found_keywords = find_keywords(_LEGAL_KEYWORD_AUTOMATON, _ALL_LEGAL_KEYWORDS, text_lower)
         legal_sections = {}
         
-        for section, keywords in legal_keywords.items():
-            count = sum(1 for keyword in keywords if keyword in text_lower)
+        for section, keywords in LEGAL_KEYWORDS.items():
+            count = sum(1 for keyword in keywords if keyword in found_keywords)
             legal_sections[section] = {
                 "keyword_count": count,
                 "present": count > 0
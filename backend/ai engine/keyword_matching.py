@@ -0,0 +1,38 @@
+"""
+Keyword Matching - Multi-keyword search shared by the AI Engine modules
+Finds every keyword of a set in one pass with Aho-Corasick, or by substring checks when pyahocorasick is missing
+"""
+
+from typing import Any, Iterable, Optional
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+def build_keyword_automaton(keywords: Iterable[str]) -> Optional[Any]:
+    """Build an Aho-Corasick automaton over keywords, or None when pyahocorasick is missing"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+def find_keywords(automaton, keywords: Iterable[str], text_lower: str) -> set:
+    """Return the keywords occurring in text_lower, scanning it once when an automaton is available"""
+    if automaton is not None:
+        return {keyword for _, keyword in automaton.iter(text_lower)}
+    return {keyword for keyword in keywords if keyword in text_lower}
+
+
+def contains_keyword(automaton, keywords: Iterable[str], text_lower: str) -> bool:
+    """Whether any keyword occurs in text_lower, in one automaton pass when available"""
+    if automaton is not None:
+        return next(automaton.iter(text_lower), None) is not None
+    return any(keyword in text_lower for keyword in keywords)
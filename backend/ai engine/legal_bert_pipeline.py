@@ -11,27 +11,106 @@ from transformers import (
     pipeline
 )
 import logging
+import os
+import re
+import contextlib
+import bisect
+import functools
 from typing import List, Dict, Any, Optional
+from pathlib import Path
 import numpy as np
 
+try:
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTModelForTokenClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+try:
+    from .keyword_matching import build_keyword_automaton, find_keywords
+except ImportError:
+    from keyword_matching import build_keyword_automaton, find_keywords
+
 logger = logging.getLogger(__name__)
 
+# Inference only: allow TF32 matmuls and let cuDNN pick the fastest kernels on GPU
+if torch.cuda.is_available():
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.benchmark = True
+
+# Exported ONNX graphs are kept here and reused across restarts
+ONNX_CACHE_DIR = os.getenv("DEVSECOPS_ONNX_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "devsecops-compliance", "onnx"))
+
+# Batched runs between releases of cached CUDA blocks; variable-length batches fragment the allocator
+CUDA_EMPTY_CACHE_EVERY = int(os.getenv("DEVSECOPS_CUDA_EMPTY_CACHE_EVERY", "8"))
+
+# BERT-family models used here accept at most 512 tokens per input
+MAX_INPUT_TOKENS = 512
+
+ACTION_KEYWORDS = (
+    "implement", "establish", "maintain", "report", "disclose",
+    "monitor", "audit", "review", "assess", "document", "file",
+    "submit", "notify", "inform", "register", "license"
+)
+
+# Earlier keywords take precedence when a sentence contains several
+OBLIGATION_KEYWORDS = (
+    "must", "shall", "required", "mandatory", "obligated", "duty",
+    "responsible", "liable", "compliance", "regulation", "law"
+)
+
+# Substring matches (no word boundaries), found at every position by the lookahead
+_OBLIGATION_PATTERN = re.compile("(?=(" + "|".join(map(re.escape, OBLIGATION_KEYWORDS)) + "))")
+_OBLIGATION_RANK = {keyword: rank for rank, keyword in enumerate(OBLIGATION_KEYWORDS)}
+_ACTION_AUTOMATON = build_keyword_automaton(ACTION_KEYWORDS)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_pretrained(loader, model_name: str, torch_dtype: Optional[torch.dtype] = None):
+    """
+    Load pretrained weights or a tokenizer once per process
+    
+    Every LegalBERTPipeline instance shares the loaded objects; each instance
+    builds its own pipeline wrappers around them, so per-instance changes such as
+    quantization or ONNX export (which replace pipe.model) do not leak between them.
+    """
+    kwargs = {} if torch_dtype is None else {"torch_dtype": torch_dtype}
+    return loader.from_pretrained(model_name, **kwargs)
+
 class LegalBERTPipeline:
     """
     Legal-BERT pipeline for compliance analysis and legal text processing
     """
     
-    def __init__(self, model_name: str = "nlpaueb/legal-bert-base-uncased"):
+    def __init__(self, model_name: str = "nlpaueb/legal-bert-base-uncased", half: bool = False,
+                 num_threads: Optional[int] = None):
         """
         Initialize Legal-BERT pipeline
         
         Args:
             model_name: HuggingFace model identifier for Legal-BERT
+            half: Run inference in reduced precision (FP16 on CUDA, BF16 autocast on capable CPUs)
+            num_threads: Intra-op thread count for CPU inference (None keeps the torch default)
         """
         self.model_name = model_name
+        self.half = half
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         logger.info(f"Using device: {self.device}")
         
+        if num_threads and self.device.type == "cpu":
+            torch.set_num_threads(num_threads)
+            logger.info(f"Using {num_threads} torch threads for CPU inference")
+        
+        # Autocast dtype used during forward passes (None = full precision)
+        self._autocast_dtype = None
+        
+        # Load weights directly in FP16 on CUDA instead of converting after loading
+        self._load_dtype = torch.float16 if half and self.device.type == "cuda" else None
+        
+        # Batched runs since start, for periodic CUDA cache release
+        self._gpu_batch_runs = 0
+        
         # Initialize components
         self.tokenizer = None
         self.classification_model = None
@@ -41,24 +120,26 @@ class LegalBERTPipeline:
         
         # Load models
         self._load_models()
+        self._configure_precision()
     
     def _load_models(self):
         """Load Legal-BERT models and create pipelines"""
+        device = 0 if torch.cuda.is_available() else -1
         try:
             logger.info(f"Loading Legal-BERT tokenizer: {self.model_name}")
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            self.tokenizer = _load_pretrained(AutoTokenizer, self.model_name)
             
             # Try to load classification model
             try:
                 logger.info("Loading Legal-BERT classification model...")
-                self.classification_model = AutoModelForSequenceClassification.from_pretrained(
-                    self.model_name
+                self.classification_model = _load_pretrained(
+                    AutoModelForSequenceClassification, self.model_name, self._load_dtype
                 )
                 self.classification_pipeline = pipeline(
                     "text-classification",
                     model=self.classification_model,
                     tokenizer=self.tokenizer,
-                    device=0 if torch.cuda.is_available() else -1
+                    device=device
                 )
                 logger.info("Classification model loaded successfully")
             except Exception as e:
@@ -66,42 +147,223 @@ class LegalBERTPipeline:
                 # Fallback to a general legal classification model
                 self.classification_pipeline = pipeline(
                     "text-classification",
-                    model="ProsusAI/finbert",
-                    device=0 if torch.cuda.is_available() else -1
+                    model=_load_pretrained(AutoModelForSequenceClassification, "ProsusAI/finbert", self._load_dtype),
+                    tokenizer=_load_pretrained(AutoTokenizer, "ProsusAI/finbert"),
+                    device=device
                 )
             
             # Try to load NER model
             try:
                 logger.info("Loading Legal-BERT NER model...")
                 # Try legal-specific NER model first
+                self.ner_model = _load_pretrained(AutoModelForTokenClassification, "law-ai/InLegalBERT", self._load_dtype)
                 self.ner_pipeline = pipeline(
                     "ner",
-                    model="law-ai/InLegalBERT",
-                    tokenizer="law-ai/InLegalBERT",
+                    model=self.ner_model,
+                    tokenizer=_load_pretrained(AutoTokenizer, "law-ai/InLegalBERT"),
                     aggregation_strategy="simple",
-                    device=0 if torch.cuda.is_available() else -1
+                    device=device
                 )
                 logger.info("Legal NER model loaded successfully")
             except Exception as e:
                 logger.warning(f"Could not load legal NER model: {e}")
                 # Fallback to general NER
+                ner_fallback = "dbmdz/bert-large-cased-finetuned-conll03-english"
+                self.ner_model = _load_pretrained(AutoModelForTokenClassification, ner_fallback, self._load_dtype)
                 self.ner_pipeline = pipeline(
                     "ner",
-                    model="dbmdz/bert-large-cased-finetuned-conll03-english",
+                    model=self.ner_model,
+                    tokenizer=_load_pretrained(AutoTokenizer, ner_fallback),
                     aggregation_strategy="simple",
-                    device=0 if torch.cuda.is_available() else -1
+                    device=device
                 )
                 
         except Exception as e:
             logger.error(f"Failed to load Legal-BERT models: {e}")
             raise
     
-    def classify_compliance_text(self, text: str) -> Dict[str, Any]:
+    def _configure_precision(self):
+        """Put models in eval mode, freeze weights and enable reduced precision where supported"""
+        models = [p.model for p in (self.classification_pipeline, self.ner_pipeline) if p is not None]
+        for model in models:
+            model.eval()
+            model.requires_grad_(False)
+        
+        if not self.half:
+            return
+        
+        if self.device.type == "cuda":
+            for model in models:
+                model.half()
+            self._autocast_dtype = torch.float16
+            logger.info("Legal-BERT models converted to FP16")
+        elif self._cpu_supports_bf16():
+            torch.set_float32_matmul_precision("medium")
+            self._autocast_dtype = torch.bfloat16
+            logger.info("Legal-BERT inference will use BF16 autocast on CPU")
+    
+    def quantize_int8(self):
+        """
+        Apply dynamic INT8 quantization to the models' Linear layers
+        
+        Only applies on CPU, where inference is bound by memory bandwidth
+        on the large Linear weight matrices.
+        """
+        if self.device.type != "cpu":
+            logger.info("Skipping INT8 quantization on GPU device")
+            return
+        
+        for pipe in (self.classification_pipeline, self.ner_pipeline):
+            if pipe is not None:
+                pipe.model = torch.quantization.quantize_dynamic(
+                    pipe.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+        
+        if self.classification_pipeline is not None:
+            self.classification_model = self.classification_pipeline.model
+        
+        # Quantized Linear kernels take FP32 activations; autocast does not apply
+        self._autocast_dtype = None
+        logger.info("Legal-BERT models quantized to INT8")
+    
+    def export_onnx(self, quantize: bool = False, cache_dir: Optional[str] = None) -> bool:
+        """
+        Re-export the models to ONNX Runtime graphs for CPU inference
+        
+        ONNX Runtime applies graph optimizations (fused attention, LayerNorm and
+        GELU kernels) that PyTorch eager mode does not. Tokenizers are unchanged.
+        
+        Args:
+            quantize: Also apply dynamic INT8 quantization to the exported graphs
+            cache_dir: Where exported graphs are stored and reused (default: ONNX_CACHE_DIR)
+            
+        Returns:
+            True if at least one pipeline now runs on ONNX Runtime
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            logger.info("optimum[onnxruntime] not installed, keeping PyTorch models")
+            return False
+        
+        if self.device.type != "cpu":
+            logger.info("Skipping ONNX export on GPU device")
+            return False
+        
+        cache_dir = Path(cache_dir or ONNX_CACHE_DIR)
+        exported = False
+        
+        if self.classification_pipeline is not None:
+            try:
+                model = self._load_ort_model(
+                    ORTModelForSequenceClassification, self.classification_pipeline.model.name_or_path,
+                    quantize, cache_dir
+                )
+                self.classification_pipeline = pipeline(
+                    "text-classification",
+                    model=model,
+                    tokenizer=self.classification_pipeline.tokenizer
+                )
+                self.classification_model = model
+                exported = True
+            except Exception as e:
+                logger.warning(f"ONNX export of classification model failed: {e}")
+        
+        if self.ner_pipeline is not None:
+            try:
+                model = self._load_ort_model(
+                    ORTModelForTokenClassification, self.ner_pipeline.model.name_or_path,
+                    quantize, cache_dir
+                )
+                self.ner_pipeline = pipeline(
+                    "ner",
+                    model=model,
+                    tokenizer=self.ner_pipeline.tokenizer,
+                    aggregation_strategy="simple"
+                )
+                self.ner_model = model
+                exported = True
+            except Exception as e:
+                logger.warning(f"ONNX export of NER model failed: {e}")
+        
+        if exported:
+            # ONNX Runtime runs its own kernels; torch autocast does not apply
+            self._autocast_dtype = None
+            logger.info(f"Legal-BERT models exported to ONNX Runtime{' (INT8)' if quantize else ''}")
+        
+        return exported
+    
+    def _load_ort_model(self, ort_class, model_id: str, quantize: bool, cache_dir: Path):
+        """
+        Load an ONNX Runtime model, exporting (and optionally quantizing) it on first use
+        
+        Args:
+            ort_class: optimum ORTModelFor* class matching the task
+            model_id: HuggingFace model identifier or local path of the PyTorch model
+            quantize: Load the dynamically INT8-quantized graph
+            cache_dir: Root directory for exported graphs
+            
+        Returns:
+            ORT model usable with HF pipelines
+        """
+        export_dir = cache_dir / model_id.replace("/", "--")
+        file_name = "model_quantized.onnx" if quantize else "model.onnx"
+        
+        if not (export_dir / "model.onnx").exists():
+            logger.info(f"Exporting {model_id} to ONNX in {export_dir}")
+            ort_class.from_pretrained(model_id, export=True).save_pretrained(export_dir)
+        
+        if quantize and not (export_dir / file_name).exists():
+            logger.info(f"Quantizing ONNX graph for {model_id} to INT8")
+            # VNNI int8 dot products on AVX-512 hardware, AVX2 kernels elsewhere
+            if self._cpu_supports_bf16():
+                qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            else:
+                qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+            ORTQuantizer.from_pretrained(export_dir, file_name="model.onnx").quantize(
+                save_dir=export_dir, quantization_config=qconfig
+            )
+        
+        return ort_class.from_pretrained(export_dir, file_name=file_name, provider="CPUExecutionProvider")
+    
+    def _cpu_supports_bf16(self) -> bool:
+        """Check whether the CPU has native BF16 support (AVX-512 class hardware)"""
+        try:
+            return "AVX512" in torch.backends.cpu.get_cpu_capability()
+        except Exception:
+            return False
+    
+    def _inference_context(self):
+        """Context for forward passes: no autograd tracking, optional autocast"""
+        stack = contextlib.ExitStack()
+        stack.enter_context(torch.inference_mode())
+        if self._autocast_dtype is not None:
+            stack.enter_context(torch.autocast(device_type=self.device.type, dtype=self._autocast_dtype))
+        return stack
+    
+    def encode(self, text: str):
+        """
+        Tokenize text once for the classification model
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            Model inputs (truncated to the model's maximum length) on the pipeline device
+        """
+        if not self.classification_pipeline:
+            raise ValueError("Classification pipeline not available")
+        
+        tokenizer = self.classification_pipeline.tokenizer
+        return tokenizer(
+            text, return_tensors="pt", truncation=True, max_length=self._max_input_length(tokenizer)
+        ).to(self.device)
+    
+    def classify_compliance_text(self, text: str, encoding=None) -> Dict[str, Any]:
         """
         Classify legal/compliance text using Legal-BERT
         
         Args:
             text: Input text to classify
+            encoding: Optional output of encode(text), skips tokenizing the text again
             
         Returns:
             Classification results with confidence scores
@@ -110,23 +372,12 @@ class LegalBERTPipeline:
             if not self.classification_pipeline:
                 raise ValueError("Classification pipeline not available")
             
-            # Truncate text if too long
-            max_length = 512
-            if len(text.split()) > max_length:
-                text = ' '.join(text.split()[:max_length])
-            
-            results = self.classification_pipeline(text)
-            
-            # Process results
-            if isinstance(results, list):
-                results = results[0]
+            # Tokenizer truncation keeps the input within the model's token limit
+            if encoding is None:
+                encoding = self.encode(text)
+            results = self._classify_encoding(encoding)
             
-            return {
-                "label": results.get("label", "UNKNOWN"),
-                "confidence": results.get("score", 0.0),
-                "text_length": len(text),
-                "model_used": "legal-bert"
-            }
+            return self._format_classification(results, text)
             
         except Exception as e:
             logger.error(f"Classification failed: {e}")
@@ -137,12 +388,28 @@ class LegalBERTPipeline:
                 "text_length": len(text)
             }
     
-    def extract_legal_entities(self, text: str) -> List[Dict[str, Any]]:
+    def _classify_encoding(self, encoding) -> Dict[str, Any]:
+        """Run the classification model on pre-tokenized inputs, scoring like the HF pipeline"""
+        model = self.classification_pipeline.model
+        with self._inference_context():
+            logits = model(**encoding).logits[0].float()
+        
+        if model.config.num_labels == 1 or model.config.problem_type == "multi_label_classification":
+            scores = logits.sigmoid()
+        else:
+            scores = logits.softmax(dim=-1)
+        
+        score, label_id = scores.max(dim=-1)
+        return {"label": model.config.id2label[label_id.item()], "score": score.item()}
+    
+    def extract_legal_entities(self, text: str, encoding=None) -> List[Dict[str, Any]]:
         """
         Extract legal entities using Legal-BERT NER
         
         Args:
             text: Input text for entity extraction
+            encoding: Optional output of encode(text), used to skip the truncation
+                      pass when the NER model shares the classification tokenizer
             
         Returns:
             List of extracted entities with types and confidence
@@ -151,27 +418,11 @@ class LegalBERTPipeline:
             if not self.ner_pipeline:
                 raise ValueError("NER pipeline not available")
             
-            # Truncate text if too long
-            max_length = 512
-            if len(text.split()) > max_length:
-                text = ' '.join(text.split()[:max_length])
-            
-            entities = self.ner_pipeline(text)
+            text = self._truncate_text(text, self.ner_pipeline.tokenizer, encoding=encoding)
+            with self._inference_context():
+                entities = self.ner_pipeline(text)
             
-            # Process and enhance entities
-            processed_entities = []
-            for entity in entities:
-                processed_entity = {
-                    "text": entity.get("word", ""),
-                    "label": entity.get("entity_group", entity.get("entity", "UNKNOWN")),
-                    "confidence": entity.get("score", 0.0),
-                    "start": entity.get("start", 0),
-                    "end": entity.get("end", 0),
-                    "entity_type": self._classify_legal_entity_type(entity.get("entity_group", ""))
-                }
-                processed_entities.append(processed_entity)
-            
-            return processed_entities
+            return self._format_entities(entities)
             
         except Exception as e:
             logger.error(f"Entity extraction failed: {e}")
@@ -182,6 +433,70 @@ class LegalBERTPipeline:
                 "error": str(e)
             }]
     
+    def _max_input_length(self, tokenizer) -> int:
+        """Maximum number of tokens per model input for this tokenizer"""
+        return min(tokenizer.model_max_length, MAX_INPUT_TOKENS)
+    
+    def _truncate_text(self, text: str, tokenizer, encoding=None) -> str:
+        """
+        Truncate text to the longest prefix that fits the model's token limit
+        
+        The cut is placed at the end of the last token kept by the tokenizer, so
+        the pipeline re-tokenizes to the same (truncated) input.
+        """
+        max_length = self._max_input_length(tokenizer)
+        
+        # WordPiece tokens span at least one character, so short texts always fit
+        if len(text) + tokenizer.num_special_tokens_to_add() < max_length:
+            return text
+        
+        # An untruncated encoding from the same tokenizer means the text fits as is
+        if (encoding is not None and self.classification_pipeline is not None
+                and tokenizer is self.classification_pipeline.tokenizer
+                and encoding["input_ids"].shape[-1] < max_length):
+            return text
+        
+        try:
+            encoding = tokenizer(text, truncation=True, max_length=max_length, return_offsets_mapping=True)
+        except NotImplementedError:
+            # Slow tokenizers have no offset mapping; fall back to a whitespace word budget
+            words = text.split()
+            return ' '.join(words[:max_length]) if len(words) > max_length else text
+        
+        if len(encoding["input_ids"]) < max_length:
+            return text
+        
+        end = max((token_end for _, token_end in encoding["offset_mapping"]), default=len(text))
+        return text[:end]
+    
+    def _format_classification(self, results: Any, text: str) -> Dict[str, Any]:
+        """Convert raw classification pipeline output to the result format"""
+        if isinstance(results, list):
+            results = results[0]
+        
+        return {
+            "label": results.get("label", "UNKNOWN"),
+            "confidence": results.get("score", 0.0),
+            "text_length": len(text),
+            "model_used": "legal-bert"
+        }
+    
+    def _format_entities(self, entities: List[Dict]) -> List[Dict[str, Any]]:
+        """Convert raw NER pipeline output to the entity format"""
+        processed_entities = []
+        for entity in entities:
+            processed_entity = {
+                "text": entity.get("word", ""),
+                "label": entity.get("entity_group", entity.get("entity", "UNKNOWN")),
+                "confidence": entity.get("score", 0.0),
+                "start": entity.get("start", 0),
+                "end": entity.get("end", 0),
+                "entity_type": self._classify_legal_entity_type(entity.get("entity_group", ""))
+            }
+            processed_entities.append(processed_entity)
+        
+        return processed_entities
+    
     def _classify_legal_entity_type(self, entity_label: str) -> str:
         """
         Classify entity type for legal context
@@ -204,39 +519,35 @@ class LegalBERTPipeline:
         
         return legal_mappings.get(entity_label.upper(), "other")
     
-    def analyze_compliance_obligations(self, text: str) -> Dict[str, Any]:
+    def analyze_compliance_obligations(self, text: str, encoding=None,
+                                       text_lower: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyze text for compliance obligations, subjects, and actions
         
         Args:
             text: Legal/compliance text to analyze
+            encoding: Optional output of encode(text) reused for classification and NER
+            text_lower: Optional text.lower() already computed by the caller
             
         Returns:
             Analysis results with obligations, subjects, and actions
         """
         try:
+            # Tokenize once; the classification and NER models come from different
+            # checkpoints, so the encoder passes themselves cannot be shared
+            if encoding is None and self.classification_pipeline:
+                try:
+                    encoding = self.encode(text)
+                except Exception as e:
+                    logger.warning(f"Tokenization failed, steps will tokenize separately: {e}")
+            
             # Get classification
-            classification = self.classify_compliance_text(text)
+            classification = self.classify_compliance_text(text, encoding=encoding)
             
             # Get entities
-            entities = self.extract_legal_entities(text)
+            entities = self.extract_legal_entities(text, encoding=encoding)
             
-            # Extract compliance-specific information
-            obligations = self._extract_obligations(text, entities)
-            subjects = self._extract_subjects(entities)
-            actions = self._extract_actions(text, entities)
-            
-            return {
-                "classification": classification,
-                "entities": entities,
-                "compliance_analysis": {
-                    "obligations": obligations,
-                    "subjects": subjects,
-                    "actions": actions,
-                    "compliance_score": self._calculate_compliance_score(text, entities),
-                    "risk_level": self._assess_risk_level(classification, obligations)
-                }
-            }
+            return self._build_compliance_analysis(text, classification, entities, text_lower)
             
         except Exception as e:
             logger.error(f"Compliance analysis failed: {e}")
@@ -247,36 +558,182 @@ class LegalBERTPipeline:
                 "compliance_analysis": {}
             }
     
-    def _extract_obligations(self, text: str, entities: List[Dict]) -> List[Dict[str, Any]]:
+    def classify_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, Any]]:
+        """
+        Classify several texts with batched forward passes
+        
+        Args:
+            texts: Input texts to classify
+            batch_size: Number of texts per forward pass
+            
+        Returns:
+            One classification result per input text, in input order
+        """
+        if not texts:
+            return []
+        
+        try:
+            if not self.classification_pipeline:
+                raise ValueError("Classification pipeline not available")
+            
+            tokenizer = self.classification_pipeline.tokenizer
+            results = self._run_batched(
+                self.classification_pipeline, texts, batch_size,
+                truncation=True, max_length=self._max_input_length(tokenizer)
+            )
+            return [self._format_classification(result, text) for result, text in zip(results, texts)]
+            
+        except Exception as e:
+            logger.warning(f"Batched classification failed, classifying texts individually: {e}")
+            return [self.classify_compliance_text(text) for text in texts]
+    
+    def extract_entities_batch(self, texts: List[str], batch_size: int = 32) -> List[List[Dict[str, Any]]]:
+        """
+        Extract legal entities from several texts with batched forward passes
+        
+        Args:
+            texts: Input texts for entity extraction
+            batch_size: Number of texts per forward pass
+            
+        Returns:
+            One entity list per input text, in input order
+        """
+        if not texts:
+            return []
+        
+        try:
+            if not self.ner_pipeline:
+                raise ValueError("NER pipeline not available")
+            
+            batch = [self._truncate_text(text, self.ner_pipeline.tokenizer) for text in texts]
+            results = self._run_batched(self.ner_pipeline, batch, batch_size)
+            return [self._format_entities(entities) for entities in results]
+            
+        except Exception as e:
+            logger.warning(f"Batched entity extraction failed, extracting texts individually: {e}")
+            return [self.extract_legal_entities(text) for text in texts]
+    
+    def _run_batched(self, pipe, texts: List[str], batch_size: int, **pipe_kwargs) -> List[Any]:
+        """Run a HF pipeline over texts in length-sorted batches, returning outputs in input order"""
+        # Sort by length so texts padded together have similar lengths
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        
+        try:
+            with self._inference_context():
+                outputs = pipe([texts[i] for i in order], batch_size=batch_size, **pipe_kwargs)
+        finally:
+            self._release_gpu_memory()
+        
+        results = [None] * len(texts)
+        for position, index in enumerate(order):
+            results[index] = outputs[position]
+        return results
+    
+    def _release_gpu_memory(self):
+        """Return cached CUDA blocks to the driver every CUDA_EMPTY_CACHE_EVERY batched runs"""
+        if self.device.type != "cuda":
+            return
+        
+        self._gpu_batch_runs += 1
+        if self._gpu_batch_runs % CUDA_EMPTY_CACHE_EVERY == 0:
+            torch.cuda.empty_cache()
+    
+    def analyze_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, Any]]:
+        """
+        Analyze several texts for compliance obligations using batched model calls
+        
+        Args:
+            texts: Legal/compliance texts to analyze
+            batch_size: Number of texts per forward pass
+            
+        Returns:
+            One analysis result per input text, in input order
+        """
+        if not texts:
+            return []
+        
+        classifications = self.classify_batch(texts, batch_size)
+        entity_lists = self.extract_entities_batch(texts, batch_size)
+        
+        return [
+            self._build_compliance_analysis(text, classification, entities)
+            for text, classification, entities in zip(texts, classifications, entity_lists)
+        ]
+    
+    def _build_compliance_analysis(self, text: str, classification: Dict[str, Any],
+                                   entities: List[Dict[str, Any]],
+                                   text_lower: Optional[str] = None) -> Dict[str, Any]:
+        """Assemble compliance analysis results from classification and entities"""
+        # Lowercase once for all keyword checks
+        if text_lower is None:
+            text_lower = text.lower()
+        
+        # Extract compliance-specific information
+        obligations = self._extract_obligations(text, entities, text_lower)
+        subjects = self._extract_subjects(entities)
+        actions = self._extract_actions(text, entities, text_lower)
+        
+        return {
+            "classification": classification,
+            "entities": entities,
+            "compliance_analysis": {
+                "obligations": obligations,
+                "subjects": subjects,
+                "actions": actions,
+                "compliance_score": self._calculate_compliance_score(text, entities, text_lower),
+                "risk_level": self._assess_risk_level(classification, obligations)
+            }
+        }
+    
+    def _extract_obligations(self, text: str, entities: List[Dict],
+                             text_lower: Optional[str] = None) -> List[Dict[str, Any]]:
         """Extract compliance obligations from text"""
         obligations = []
         
-        # Look for obligation keywords
-        obligation_keywords = [
-            "must", "shall", "required", "mandatory", "obligated", "duty",
-            "responsible", "liable", "compliance", "regulation", "law"
-        ]
+        # ASCII lowercasing maps characters one to one, so sentences split from the
+        # lowered text are already lowercase and keep the original offsets
+        presplit_lower = text_lower is not None and text.isascii()
+        sentences = (text_lower if presplit_lower else text).split('.')
+        
+        # offsets[i] = len('.'.join(sentences[:i])), computed in one pass
+        offsets = [0]
+        for i, sentence in enumerate(sentences):
+            offsets.append(offsets[-1] + len(sentence) + (1 if i > 0 else 0))
+        
+        # Entity indices ordered by start offset, for range lookups per sentence
+        entity_order = sorted(range(len(entities)), key=lambda k: entities[k].get("start", 0))
+        entity_starts = [entities[k].get("start", 0) for k in entity_order]
         
-        sentences = text.split('.')
         for i, sentence in enumerate(sentences):
-            sentence = sentence.strip().lower()
+            sentence = sentence.strip() if presplit_lower else sentence.strip().lower()
             
-            for keyword in obligation_keywords:
-                if keyword in sentence:
-                    obligations.append({
-                        "text": sentence,
-                        "keyword": keyword,
-                        "sentence_index": i,
-                        "entities_in_sentence": [
-                            e for e in entities 
-                            if e.get("start", 0) >= len('.'.join(sentences[:i])) and 
-                               e.get("end", 0) <= len('.'.join(sentences[:i+1]))
-                        ]
-                    })
-                    break
+            # One regex scan per sentence finds every obligation keyword present
+            found = _OBLIGATION_PATTERN.findall(sentence)
+            if found:
+                obligations.append({
+                    "text": sentence,
+                    "keyword": min(found, key=_OBLIGATION_RANK.__getitem__),
+                    "sentence_index": i,
+                    "entities_in_sentence": self._entities_in_range(
+                        entities, entity_order, entity_starts, offsets[i], offsets[i + 1]
+                    )
+                })
         
         return obligations
     
+    def _entities_in_range(self, entities: List[Dict], entity_order: List[int], entity_starts: List[int],
+                           range_start: int, range_end: int) -> List[Dict]:
+        """Entities with range_start <= start and end <= range_end, in their original order"""
+        matched = []
+        position = bisect.bisect_left(entity_starts, range_start)
+        while position < len(entity_starts) and entity_starts[position] <= range_end:
+            index = entity_order[position]
+            if entities[index].get("end", 0) <= range_end:
+                matched.append(index)
+            position += 1
+        
+        return [entities[index] for index in sorted(matched)]
+    
     def _extract_subjects(self, entities: List[Dict]) -> List[Dict[str, Any]]:
         """Extract legal subjects from entities"""
         subjects = []
@@ -291,25 +748,18 @@ class LegalBERTPipeline:
         
         return subjects
     
-    def _extract_actions(self, text: str, entities: List[Dict]) -> List[str]:
+    def _extract_actions(self, text: str, entities: List[Dict], text_lower: Optional[str] = None) -> List[str]:
         """Extract compliance actions from text"""
-        action_keywords = [
-            "implement", "establish", "maintain", "report", "disclose",
-            "monitor", "audit", "review", "assess", "document", "file",
-            "submit", "notify", "inform", "register", "license"
-        ]
-        
-        actions = []
-        text_lower = text.lower()
-        
-        for keyword in action_keywords:
-            if keyword in text_lower:
-                actions.append(keyword)
-        
-        return list(set(actions))  # Remove duplicates
+        if text_lower is None:
+            text_lower = text.lower()
+        found = find_keywords(_ACTION_AUTOMATON, ACTION_KEYWORDS, text_lower)
+        return [keyword for keyword in ACTION_KEYWORDS if keyword in found]
     
-    def _calculate_compliance_score(self, text: str, entities: List[Dict]) -> float:
+    def _calculate_compliance_score(self, text: str, entities: List[Dict], text_lower: Optional[str] = None) -> float:
         """Calculate compliance score based on analysis"""
+        if text_lower is None:
+            text_lower = text.lower()
+        
         score = 0.0
         
         # Score based on entities found
@@ -322,7 +772,7 @@ class LegalBERTPipeline:
         # Score based on legal keywords
         legal_keywords = ["compliance", "regulation", "law", "legal", "requirement"]
         for keyword in legal_keywords:
-            if keyword.lower() in text.lower():
+            if keyword in text_lower:
                 score += 0.1
         
         return min(score, 1.0)
@@ -6,7 +6,14 @@ Converts legal policies to compliance rules using transformers
 import logging
 import json
 import os
-from typing import Dict, List, Any, Optional
+import re
+import hashlib
+import functools
+import itertools
+import sqlite3
+import threading
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 import asyncio
@@ -19,8 +26,153 @@ try:
 except ImportError:
     TRANSFORMERS_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    from .keyword_matching import build_keyword_automaton, find_keywords
+except ImportError:
+    from keyword_matching import build_keyword_automaton, find_keywords
+
 logger = logging.getLogger(__name__)
 
+# Policy models; a categorizer fine-tuned on policy categories can be swapped in via the environment
+POLICY_CLASSIFIER_MODEL = os.getenv("DEVSECOPS_POLICY_CLASSIFIER_MODEL", "distilbert-base-uncased")
+POLICY_SUMMARIZER_MODEL = os.getenv("DEVSECOPS_POLICY_SUMMARIZER_MODEL", "sshleifer/distilbart-cnn-6-6")
+
+CATEGORY_KEYWORDS = {
+    "data_protection": ("personal data", "gdpr", "data protection", "privacy policy"),
+    "security": ("security", "cybersecurity", "encryption", "access control"),
+    "privacy": ("privacy", "personal information", "pii", "data subject"),
+    "compliance": ("compliance", "regulatory", "audit", "monitoring"),
+    "liability": ("liability", "damages", "indemnification", "limitation"),
+    "intellectual_property": ("intellectual property", "copyright", "trademark", "patent")
+}
+
+# Questions to extract compliance requirements
+QA_QUESTIONS = (
+    "What data must be protected?",
+    "What are the security requirements?",
+    "What are the reporting obligations?",
+    "What are the penalties for non-compliance?",
+    "What are the user rights?",
+    "What are the retention periods?",
+    "What are the consent requirements?"
+)
+
+# Phrases marking a sentence as a requirement; matched as substrings like the original per-sentence check
+REQUIREMENT_INDICATORS = (
+    "must", "shall", "required", "mandatory", "obligation",
+    "prohibited", "forbidden", "not allowed", "ensure", "implement"
+)
+_REQUIREMENT_PATTERN = re.compile("|".join(re.escape(indicator) for indicator in REQUIREMENT_INDICATORS), re.IGNORECASE)
+
+# Maximum number of rule-extracted requirements kept per policy
+MAX_RULE_REQUIREMENTS = 10
+
+# Phrases marking a sentence as an enforcement action, matched as substrings
+ENFORCEMENT_KEYWORDS = ("penalty", "fine", "violation", "breach", "sanctions", "enforcement")
+_ENFORCEMENT_PATTERN = re.compile("|".join(re.escape(keyword) for keyword in ENFORCEMENT_KEYWORDS), re.IGNORECASE)
+
+# Maximum number of enforcement actions kept per policy
+MAX_ENFORCEMENT_ACTIONS = 5
+
+# Modal words setting a generated rule's severity; whole words only, so "mustard" is not HIGH
+_HIGH_SEVERITY_PATTERN = re.compile(r'\b(?:must|mandatory|required|shall)\b', re.IGNORECASE)
+_MEDIUM_SEVERITY_PATTERN = re.compile(r'\b(?:should|recommended|advised)\b', re.IGNORECASE)
+
+# Requirement terms and the code patterns a rule mentioning them scans for
+SCAN_PATTERN_TRIGGERS = {
+    "password": ("password", "pwd", "passwd", "auth"),
+    "encrypt": ("encrypt", "decrypt", "cipher", "crypto"),
+    "log": ("log", "audit", "trace", "record"),
+    "access": ("access", "permission", "authorize", "role"),
+    "data": ("personal_data", "pii", "sensitive", "confidential")
+}
+
+# Policies are summarized from their first SUMMARY_INPUT_CHARS characters, SUMMARY_BATCH_SIZE per forward pass
+SUMMARY_INPUT_CHARS = 1000
+SUMMARY_BATCH_SIZE = int(os.getenv("DEVSECOPS_SUMMARY_BATCH_SIZE", 16))
+
+# Bump when the analysis of a policy changes so cached results are not reused
+ANALYSIS_CACHE_VERSION = 1
+
+# Fields of a processed policy that depend only on its content and the loaded models
+CACHED_ANALYSIS_FIELDS = (
+    "metadata", "categories", "key_requirements", "compliance_rules", "enforcement_actions", "summary"
+)
+
+# Stored JSON files larger than this are parsed incrementally when ijson is installed
+STREAM_JSON_THRESHOLD = int(os.getenv("DEVSECOPS_STREAM_JSON_THRESHOLD", 64 * 1024 * 1024))
+
+_ALL_CATEGORY_KEYWORDS = frozenset(keyword for keywords in CATEGORY_KEYWORDS.values() for keyword in keywords)
+_CATEGORY_AUTOMATON = build_keyword_automaton(_ALL_CATEGORY_KEYWORDS)
+
+
+@functools.lru_cache(maxsize=8192)
+def _scan_patterns_for(requirement: str) -> Tuple[str, ...]:
+    """Scan patterns triggered by a requirement, memoized since boilerplate requirements recur across policies"""
+    req_lower = requirement.lower()
+    return tuple(
+        pattern
+        for trigger, patterns in SCAN_PATTERN_TRIGGERS.items() if trigger in req_lower
+        for pattern in patterns
+    )
+
+
+def _iter_matching_sentences(pattern: re.Pattern, content: str) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (sentence index, sentence) for each '.'-delimited sentence of content matching pattern
+    
+    One regex pass over the document; each hit is widened to its sentence, so the
+    content is never split or lowercased sentence by sentence.
+    """
+    sentence_index = 0
+    counted_to = 0
+    position = 0
+    
+    while True:
+        match = pattern.search(content, position)
+        if match is None:
+            return
+        
+        start = content.rfind('.', 0, match.start()) + 1
+        end = content.find('.', match.end())
+        if end == -1:
+            end = len(content)
+        
+        sentence_index += content.count('.', counted_to, start)
+        counted_to = start
+        position = end + 1
+        
+        yield sentence_index, content[start:end]
+
+
+def _iter_file_entries(root) -> Iterator[os.DirEntry]:
+    """Yield the files below root in one os.scandir walk, using dirent types instead of a stat per entry"""
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+        except OSError as e:
+            logger.warning(f"Could not list directory {directory}: {e}")
+
+
 class PolicyProcessor:
     """
     Processes legal policies and converts them to compliance rules using AI
@@ -45,9 +197,32 @@ class PolicyProcessor:
         self.processed_policies = {}
         self.compliance_rules = {}
         
+        # Bumped whenever compliance_rules changes so callers can invalidate derived data
+        self._rules_cache_version = 0
+        
+        # Content-hash keyed cache of policy analyses, shared across runs
+        self._analysis_cache = None
+        self._analysis_cache_lock = threading.Lock()
+        
         self._initialize_transformers()
+        self._open_analysis_cache()
         self._load_existing_policies()
     
+    @classmethod
+    async def create(cls, policies_dir: str = "policies") -> "PolicyProcessor":
+        """
+        Construct a PolicyProcessor without blocking the event loop
+        
+        Model loading and reading the stored policies happen in a worker thread.
+        
+        Args:
+            policies_dir: Directory containing policy documents
+            
+        Returns:
+            Initialized PolicyProcessor
+        """
+        return await asyncio.to_thread(cls, policies_dir)
+    
     def _initialize_transformers(self):
         """Initialize transformer models for policy processing"""
         if not TRANSFORMERS_AVAILABLE:
@@ -60,8 +235,7 @@ class PolicyProcessor:
             # Text classification for policy categorization
             self.text_classifier = pipeline(
                 "text-classification",
-                model="microsoft/DialoGPT-medium",
-                return_all_scores=True
+                model=POLICY_CLASSIFIER_MODEL
             )
             
             # Question-answering for extracting specific requirements
@@ -73,7 +247,7 @@ class PolicyProcessor:
             # Summarization for policy condensation
             self.summarizer = pipeline(
                 "summarization",
-                model="facebook/bart-large-cnn",
+                model=POLICY_SUMMARIZER_MODEL,
                 max_length=200,
                 min_length=50
             )
@@ -86,6 +260,64 @@ class PolicyProcessor:
             self.qa_pipeline = None
             self.summarizer = None
     
+    def _open_analysis_cache(self):
+        """Open (creating if needed) the SQLite analysis cache in the policies directory"""
+        try:
+            self._analysis_cache = sqlite3.connect(
+                self.policies_dir / "ai_cache.sqlite", check_same_thread=False
+            )
+            with self._analysis_cache:
+                self._analysis_cache.execute(
+                    "CREATE TABLE IF NOT EXISTS analysis_cache (key TEXT PRIMARY KEY, payload BLOB)"
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis cache unavailable, policies will always be re-analyzed: {e}")
+            self._analysis_cache = None
+    
+    def _analysis_cache_key(self, content: str) -> str:
+        """Hash of the policy content and of the pipelines that would analyze it"""
+        pipelines = "|".join([
+            POLICY_CLASSIFIER_MODEL if self.text_classifier else "-",
+            "qa" if self.qa_pipeline else "-",
+            POLICY_SUMMARIZER_MODEL if self.summarizer else "-"
+        ])
+        digest = hashlib.blake2b(f"{ANALYSIS_CACHE_VERSION}|{pipelines}|".encode(), digest_size=16)
+        digest.update(content.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+    
+    def _get_cached_analysis(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached analysis fields for a cache key, or None on a miss"""
+        if self._analysis_cache is None:
+            return None
+        
+        try:
+            with self._analysis_cache_lock:
+                row = self._analysis_cache.execute(
+                    "SELECT payload FROM analysis_cache WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis cache lookup failed: {e}")
+            return None
+        
+        if row is None:
+            return None
+        return orjson.loads(row[0]) if ORJSON_AVAILABLE else json.loads(row[0])
+    
+    def _store_cached_analysis(self, key: str, policy_data: Dict[str, Any]):
+        """Store the content-derived fields of a processed policy"""
+        if self._analysis_cache is None:
+            return
+        
+        analysis = {field: policy_data[field] for field in CACHED_ANALYSIS_FIELDS}
+        payload = orjson.dumps(analysis) if ORJSON_AVAILABLE else json.dumps(analysis).encode('utf-8')
+        try:
+            with self._analysis_cache_lock, self._analysis_cache:
+                self._analysis_cache.execute(
+                    "INSERT OR REPLACE INTO analysis_cache (key, payload) VALUES (?, ?)", (key, payload)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Analysis cache write failed: {e}")
+    
     def _load_existing_policies(self):
         """Load previously processed policies from JSON files"""
         try:
@@ -93,18 +325,41 @@ class PolicyProcessor:
             rules_json_path = self.policies_dir / "compliance_rules.json"
             
             if policies_json_path.exists():
-                with open(policies_json_path, 'r', encoding='utf-8') as f:
-                    self.processed_policies = json.load(f)
+                self.processed_policies = self._read_json_object(policies_json_path)
                 logger.info(f"Loaded {len(self.processed_policies)} existing policies")
             
             if rules_json_path.exists():
-                with open(rules_json_path, 'r', encoding='utf-8') as f:
-                    self.compliance_rules = json.load(f)
+                self.compliance_rules = self._read_json_object(rules_json_path)
+                self._rules_cache_version += 1
                 logger.info(f"Loaded {len(self.compliance_rules)} existing compliance rules")
                 
         except Exception as e:
             logger.error(f"Failed to load existing policies: {e}")
     
+    def _read_json(self, path: Path) -> Any:
+        """Parse a JSON file, using orjson when available"""
+        if ORJSON_AVAILABLE:
+            return orjson.loads(path.read_bytes())
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _read_json_object(self, path: Path) -> Dict[str, Any]:
+        """
+        Read a top-level JSON object, streaming it entry by entry if the file is large
+        
+        Streaming keeps peak memory to one entry's parse state instead of the whole
+        file's raw bytes plus the fully built object graph.
+        """
+        if not IJSON_AVAILABLE or path.stat().st_size < STREAM_JSON_THRESHOLD:
+            return self._read_json(path)
+        
+        data = {}
+        with open(path, 'rb') as f:
+            for key, value in ijson.kvitems(f, '', use_float=True):
+                data[key] = value
+        return data
+    
     def import_policy_folder(self, folder_path: str) -> Dict[str, Any]:
         """
         Import all policy documents from a folder
@@ -131,33 +386,53 @@ class PolicyProcessor:
             # Supported file types
             supported_extensions = {'.txt', '.md', '.pdf', '.doc', '.docx'}
             
-            for file_path in folder.rglob('*'):
-                if file_path.is_file() and file_path.suffix.lower() in supported_extensions:
+            # Read every policy first so their summaries can be generated in batches
+            pending = []
+            for entry in _iter_file_entries(folder):
+                if os.path.splitext(entry.name)[1].lower() in supported_extensions:
+                    file_path = Path(entry.path)
                     try:
-                        policy_content = self._read_policy_file(file_path)
-                        policy_id = self._generate_policy_id(file_path)
-                        
-                        # Process the policy
-                        processed_policy = self.process_policy(
-                            policy_id=policy_id,
-                            content=policy_content,
-                            file_path=str(file_path)
-                        )
-                        
-                        results["policies"].append(processed_policy)
-                        results["imported_count"] += 1
-                        
-                        if processed_policy.get("processing_status") == "success":
-                            results["processed_count"] += 1
-                        else:
-                            results["failed_count"] += 1
-                            
+                        pending.append((file_path, self._generate_policy_id(file_path), self._read_policy_file(file_path)))
                     except Exception as e:
                         error_msg = f"Failed to process {file_path}: {str(e)}"
                         logger.error(error_msg)
                         results["errors"].append(error_msg)
                         results["failed_count"] += 1
             
+            # Look up every policy's cached analysis once; both summarizing and processing use it
+            contents = [content for _, _, content in pending]
+            cache_keys = [self._analysis_cache_key(content) for content in contents]
+            cached_analyses = [self._get_cached_analysis(cache_key) for cache_key in cache_keys]
+            summaries = self._summarize_batch(contents, cached_analyses)
+            
+            for (file_path, policy_id, policy_content), cache_key, cached_analysis, summary in zip(
+                pending, cache_keys, cached_analyses, summaries
+            ):
+                try:
+                    # Process the policy
+                    processed_policy = self.process_policy(
+                        policy_id=policy_id,
+                        content=policy_content,
+                        file_path=str(file_path),
+                        summary=summary,
+                        cache_key=cache_key,
+                        cached_analysis=cached_analysis
+                    )
+                    
+                    results["policies"].append(processed_policy)
+                    results["imported_count"] += 1
+                    
+                    if processed_policy.get("processing_status") == "success":
+                        results["processed_count"] += 1
+                    else:
+                        results["failed_count"] += 1
+                        
+                except Exception as e:
+                    error_msg = f"Failed to process {file_path}: {str(e)}"
+                    logger.error(error_msg)
+                    results["errors"].append(error_msg)
+                    results["failed_count"] += 1
+            
             # Save updated policies
             self._save_policies()
             
@@ -169,6 +444,43 @@ class PolicyProcessor:
             results["errors"].append(str(e))
             return results
     
+    def _summarize_batch(self, contents: List[str],
+                         cached_analyses: List[Optional[Dict[str, Any]]]) -> List[Optional[str]]:
+        """
+        Summarize policies with batched summarizer calls
+        
+        Args:
+            contents: Policy texts
+            cached_analyses: Cached analysis per policy, None where there is none
+            
+        Returns:
+            Summary per policy; None where no model summary is needed, the analysis
+            is already cached, or the batch failed (process_policy then falls back)
+        """
+        summaries = [None] * len(contents)
+        if not self.summarizer:
+            return summaries
+        
+        indices = [
+            i for i, content in enumerate(contents)
+            if len(content) > 500 and cached_analyses[i] is None
+        ]
+        if not indices:
+            return summaries
+        
+        try:
+            outputs = self.summarizer(
+                [contents[i][:SUMMARY_INPUT_CHARS] for i in indices],
+                batch_size=SUMMARY_BATCH_SIZE,
+                truncation=True
+            )
+            for i, output in zip(indices, outputs):
+                summaries[i] = output["summary_text"]
+        except Exception as e:
+            logger.warning(f"Batched summarization of {len(indices)} policies failed: {e}")
+        
+        return summaries
+    
     def _read_policy_file(self, file_path: Path) -> str:
         """Read content from various file types"""
         try:
@@ -194,10 +506,13 @@ class PolicyProcessor:
             return f"Error reading file: {str(e)}"
     
     def _generate_policy_id(self, file_path: Path) -> str:
-        """Generate unique policy ID from file path"""
-        return f"policy_{file_path.stem}_{hash(str(file_path)) % 10000}"
+        """Generate unique policy ID from file path, stable across processes"""
+        digest = hashlib.blake2b(str(file_path).encode('utf-8', 'surrogatepass'), digest_size=6).hexdigest()
+        return f"policy_{file_path.stem}_{digest}"
     
-    def process_policy(self, policy_id: str, content: str, file_path: str = "") -> Dict[str, Any]:
+    def process_policy(self, policy_id: str, content: str, file_path: str = "",
+                       summary: Optional[str] = None, cache_key: Optional[str] = None,
+                       cached_analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Process a single policy document using AI
         
@@ -205,6 +520,9 @@ class PolicyProcessor:
             policy_id: Unique identifier for the policy
             content: Policy text content
             file_path: Original file path
+            summary: Optional summary already generated by _summarize_batch
+            cache_key: Analysis cache key of content, if the caller already looked it up
+            cached_analysis: The cached analysis found under cache_key (None on a miss)
             
         Returns:
             Processed policy with extracted compliance rules
@@ -225,40 +543,17 @@ class PolicyProcessor:
                 "enforcement_actions": []
             }
             
-            # Extract metadata
-            policy_data["metadata"] = self._extract_metadata(content)
-            
-            # Categorize policy using AI
-            if self.text_classifier:
-                policy_data["categories"] = self._categorize_policy(content)
-            else:
-                policy_data["categories"] = self._rule_based_categorization(content)
-            
-            # Extract key requirements using QA
-            if self.qa_pipeline:
-                policy_data["key_requirements"] = self._extract_requirements_ai(content)
+            # Reuse the analysis of identical content processed with the same pipelines
+            if cache_key is None:
+                cache_key = self._analysis_cache_key(content)
+                cached_analysis = self._get_cached_analysis(cache_key)
+            if cached_analysis is not None:
+                logger.info(f"Using cached analysis for policy {policy_id}")
+                policy_data.update(cached_analysis)
             else:
-                policy_data["key_requirements"] = self._extract_requirements_rules(content)
-            
-            # Generate compliance rules
-            policy_data["compliance_rules"] = self._generate_compliance_rules(
-                policy_data["key_requirements"],
-                policy_data["categories"]
-            )
-            
-            # Extract enforcement actions
-            policy_data["enforcement_actions"] = self._extract_enforcement_actions(content)
-            
-            # Generate summary if possible
-            if self.summarizer and len(content) > 500:
-                try:
-                    summary = self.summarizer(content[:1000])  # Limit input length
-                    policy_data["summary"] = summary[0]["summary_text"]
-                except Exception as e:
-                    logger.warning(f"Summarization failed: {e}")
-                    policy_data["summary"] = content[:200] + "..."
-            else:
-                policy_data["summary"] = content[:200] + "..."
+                self._analyze_policy_content(content, policy_data, summary)
+                if not policy_data.pop("_transient_failure", False):
+                    self._store_cached_analysis(cache_key, policy_data)
             
             # Mark as successfully processed
             policy_data["processing_status"] = "success"
@@ -271,6 +566,7 @@ class PolicyProcessor:
             for rule in policy_data["compliance_rules"]:
                 rule_id = f"{policy_id}_{rule['rule_id']}"
                 self.compliance_rules[rule_id] = rule
+            self._rules_cache_version += 1
             
             logger.info(f"Successfully processed policy {policy_id}")
             return policy_data
@@ -286,6 +582,47 @@ class PolicyProcessor:
                 "processing_duration": (datetime.now() - processing_start).total_seconds()
             }
     
+    def _analyze_policy_content(self, content: str, policy_data: Dict[str, Any], summary: Optional[str] = None):
+        """Fill in the content-derived fields of policy_data (see CACHED_ANALYSIS_FIELDS)"""
+        # Extract metadata
+        policy_data["metadata"] = self._extract_metadata(content)
+        
+        # Categorize policy using AI
+        if self.text_classifier:
+            policy_data["categories"] = self._categorize_policy(content)
+        else:
+            policy_data["categories"] = self._rule_based_categorization(content)
+        
+        # Extract key requirements using QA
+        if self.qa_pipeline:
+            policy_data["key_requirements"] = self._extract_requirements_ai(content)
+        else:
+            policy_data["key_requirements"] = self._extract_requirements_rules(content)
+        
+        # Generate compliance rules
+        policy_data["compliance_rules"] = self._generate_compliance_rules(
+            policy_data["key_requirements"],
+            policy_data["categories"]
+        )
+        
+        # Extract enforcement actions
+        policy_data["enforcement_actions"] = self._extract_enforcement_actions(content)
+        
+        # Generate summary if possible
+        if summary is not None:
+            policy_data["summary"] = summary
+        elif self.summarizer and len(content) > 500:
+            try:
+                summary = self.summarizer(content[:SUMMARY_INPUT_CHARS])  # Limit input length
+                policy_data["summary"] = summary[0]["summary_text"]
+            except Exception as e:
+                logger.warning(f"Summarization failed: {e}")
+                policy_data["summary"] = content[:200] + "..."
+                # Do not cache the fallback summary of a failed model call
+                policy_data["_transient_failure"] = True
+        else:
+            policy_data["summary"] = content[:200] + "..."
+    
     def _extract_metadata(self, content: str) -> Dict[str, Any]:
         """Extract basic metadata from policy content"""
         lines = content.split('\n')
@@ -331,23 +668,17 @@ class PolicyProcessor:
         content_lower = content.lower()
         categories = []
         
-        category_keywords = {
-            "data_protection": ["personal data", "gdpr", "data protection", "privacy policy"],
-            "security": ["security", "cybersecurity", "encryption", "access control"],
-            "privacy": ["privacy", "personal information", "pii", "data subject"],
-            "compliance": ["compliance", "regulatory", "audit", "monitoring"],
-            "liability": ["liability", "damages", "indemnification", "limitation"],
-            "intellectual_property": ["intellectual property", "copyright", "trademark", "patent"]
-        }
+        # One pass over the content finds the keywords of every category
+        found_keywords = find_keywords(_CATEGORY_AUTOMATON, _ALL_CATEGORY_KEYWORDS, content_lower)
         
-        for category, keywords in category_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in content_lower)
-            if score > 0:
-                confidence = min(score / len(keywords), 1.0)
+        for category, keywords in CATEGORY_KEYWORDS.items():
+            matched_keywords = [kw for kw in keywords if kw in found_keywords]
+            if matched_keywords:
+                confidence = min(len(matched_keywords) / len(keywords), 1.0)
                 categories.append({
                     "category": category,
                     "confidence": confidence,
-                    "matched_keywords": [kw for kw in keywords if kw in content_lower]
+                    "matched_keywords": matched_keywords
                 })
         
         return sorted(categories, key=lambda x: x["confidence"], reverse=True)
@@ -355,31 +686,28 @@ class PolicyProcessor:
     def _extract_requirements_ai(self, content: str) -> List[Dict[str, Any]]:
         """Extract key requirements using AI question-answering"""
         requirements = []
-        
-        # Questions to extract compliance requirements
-        qa_questions = [
-            "What data must be protected?",
-            "What are the security requirements?",
-            "What are the reporting obligations?",
-            "What are the penalties for non-compliance?",
-            "What are the user rights?",
-            "What are the retention periods?",
-            "What are the consent requirements?"
-        ]
+        context = content[:2000]
         
         try:
-            for question in qa_questions:
-                try:
-                    result = self.qa_pipeline(question=question, context=content[:2000])
-                    if result["score"] > 0.1:  # Confidence threshold
-                        requirements.append({
-                            "question": question,
-                            "requirement": result["answer"],
-                            "confidence": result["score"],
-                            "source": "ai_extraction"
-                        })
-                except Exception as e:
-                    logger.warning(f"QA failed for question '{question}': {e}")
+            # All questions share the context; answer them in batched forward passes
+            try:
+                results = self.qa_pipeline(
+                    question=list(QA_QUESTIONS),
+                    context=[context] * len(QA_QUESTIONS),
+                    batch_size=len(QA_QUESTIONS)
+                )
+            except Exception as e:
+                logger.warning(f"Batched QA failed, asking questions individually: {e}")
+                results = [self._answer_question(question, context) for question in QA_QUESTIONS]
+            
+            for question, result in zip(QA_QUESTIONS, results):
+                if result is not None and result["score"] > 0.1:  # Confidence threshold
+                    requirements.append({
+                        "question": question,
+                        "requirement": result["answer"],
+                        "confidence": result["score"],
+                        "source": "ai_extraction"
+                    })
             
             return requirements
             
@@ -387,27 +715,26 @@ class PolicyProcessor:
             logger.error(f"AI requirement extraction failed: {e}")
             return self._extract_requirements_rules(content)
     
+    def _answer_question(self, question: str, context: str) -> Optional[Dict[str, Any]]:
+        """Answer a single question, or None if the QA pipeline fails"""
+        try:
+            return self.qa_pipeline(question=question, context=context)
+        except Exception as e:
+            logger.warning(f"QA failed for question '{question}': {e}")
+            return None
+    
     def _extract_requirements_rules(self, content: str) -> List[Dict[str, Any]]:
         """Rule-based requirement extraction"""
-        requirements = []
-        sentences = content.split('.')
-        
-        requirement_indicators = [
-            "must", "shall", "required", "mandatory", "obligation",
-            "prohibited", "forbidden", "not allowed", "ensure", "implement"
+        sentences = _iter_matching_sentences(_REQUIREMENT_PATTERN, content)
+        return [
+            {
+                "requirement": sentence.strip(),
+                "confidence": 0.7,
+                "sentence_index": sentence_index,
+                "source": "rule_extraction"
+            }
+            for sentence_index, sentence in itertools.islice(sentences, MAX_RULE_REQUIREMENTS)
         ]
-        
-        for i, sentence in enumerate(sentences):
-            sentence_lower = sentence.lower().strip()
-            if any(indicator in sentence_lower for indicator in requirement_indicators):
-                requirements.append({
-                    "requirement": sentence.strip(),
-                    "confidence": 0.7,
-                    "sentence_index": i,
-                    "source": "rule_extraction"
-                })
-        
-        return requirements[:10]  # Limit to top 10
     
     def _generate_compliance_rules(self, requirements: List[Dict], categories: List[Dict]) -> List[Dict[str, Any]]:
         """Generate scannable compliance rules from requirements"""
@@ -435,33 +762,17 @@ class PolicyProcessor:
     
     def _determine_severity(self, requirement: str) -> str:
         """Determine rule severity based on content"""
-        req_lower = requirement.lower()
-        
-        if any(word in req_lower for word in ["must", "mandatory", "required", "shall"]):
+        if _HIGH_SEVERITY_PATTERN.search(requirement):
             return "HIGH"
-        elif any(word in req_lower for word in ["should", "recommended", "advised"]):
+        elif _MEDIUM_SEVERITY_PATTERN.search(requirement):
             return "MEDIUM"
         else:
             return "LOW"
     
     def _extract_scan_patterns(self, requirement: str) -> List[str]:
         """Extract patterns that can be scanned in code"""
-        patterns = []
-        req_lower = requirement.lower()
-        
-        # Common compliance patterns
-        if "password" in req_lower:
-            patterns.extend(["password", "pwd", "passwd", "auth"])
-        if "encrypt" in req_lower:
-            patterns.extend(["encrypt", "decrypt", "cipher", "crypto"])
-        if "log" in req_lower:
-            patterns.extend(["log", "audit", "trace", "record"])
-        if "access" in req_lower:
-            patterns.extend(["access", "permission", "authorize", "role"])
-        if "data" in req_lower:
-            patterns.extend(["personal_data", "pii", "sensitive", "confidential"])
-        
-        return patterns
+        # Fresh list per rule so the cached tuple is never shared with stored rules
+        return list(_scan_patterns_for(requirement))
     
     def _generate_compliance_check(self, requirement: str) -> Dict[str, Any]:
         """Generate compliance check logic"""
@@ -482,20 +793,14 @@ class PolicyProcessor:
     
     def _extract_enforcement_actions(self, content: str) -> List[Dict[str, Any]]:
         """Extract enforcement actions and penalties"""
-        enforcement = []
-        content_lower = content.lower()
-        
-        enforcement_keywords = ["penalty", "fine", "violation", "breach", "sanctions", "enforcement"]
-        
-        sentences = content.split('.')
-        for sentence in sentences:
-            if any(keyword in sentence.lower() for keyword in enforcement_keywords):
-                enforcement.append({
-                    "action": sentence.strip(),
-                    "type": "penalty" if "penalty" in sentence.lower() else "enforcement"
-                })
-        
-        return enforcement[:5]  # Limit results
+        sentences = _iter_matching_sentences(_ENFORCEMENT_PATTERN, content)
+        return [
+            {
+                "action": sentence.strip(),
+                "type": "penalty" if "penalty" in sentence.lower() else "enforcement"
+            }
+            for _, sentence in itertools.islice(sentences, MAX_ENFORCEMENT_ACTIONS)
+        ]
     
     def get_compliance_rules_for_scanning(self) -> Dict[str, Any]:
         """Get all compliance rules formatted for repository scanning"""
@@ -508,41 +813,42 @@ class PolicyProcessor:
     
     def _consolidate_scan_patterns(self) -> Dict[str, List[str]]:
         """Consolidate all scan patterns by category"""
-        patterns_by_category = {}
+        patterns_by_category = defaultdict(set)
         
+        # Accumulate into sets so duplicates are dropped as they arrive
         for rule in self.compliance_rules.values():
-            category = rule.get("category", "general")
-            patterns = rule.get("scan_patterns", [])
-            
-            if category not in patterns_by_category:
-                patterns_by_category[category] = []
-            
-            patterns_by_category[category].extend(patterns)
+            patterns_by_category[rule.get("category", "general")].update(rule.get("scan_patterns", ()))
         
-        # Remove duplicates
-        for category in patterns_by_category:
-            patterns_by_category[category] = list(set(patterns_by_category[category]))
-        
-        return patterns_by_category
+        return {category: list(patterns) for category, patterns in patterns_by_category.items()}
     
     def _save_policies(self):
         """Save processed policies and rules to JSON files"""
         try:
             # Save policies
-            policies_path = self.policies_dir / "processed_policies.json"
-            with open(policies_path, 'w', encoding='utf-8') as f:
-                json.dump(self.processed_policies, f, indent=2, ensure_ascii=False)
+            self._write_json(self.policies_dir / "processed_policies.json", self.processed_policies)
             
             # Save rules
-            rules_path = self.policies_dir / "compliance_rules.json"
-            with open(rules_path, 'w', encoding='utf-8') as f:
-                json.dump(self.compliance_rules, f, indent=2, ensure_ascii=False)
+            self._write_json(self.policies_dir / "compliance_rules.json", self.compliance_rules)
             
             logger.info(f"Saved {len(self.processed_policies)} policies and {len(self.compliance_rules)} rules")
             
         except Exception as e:
             logger.error(f"Failed to save policies: {e}")
     
+    def _write_json(self, path: Path, data: Any):
+        """Write data as indented UTF-8 JSON, using orjson when available"""
+        if ORJSON_AVAILABLE:
+            try:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            except orjson.JSONEncodeError as e:
+                logger.warning(f"orjson could not serialize {path.name}, using json: {e}")
+            else:
+                path.write_bytes(payload)
+                return
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    
     def get_policy_summary(self) -> Dict[str, Any]:
         """Get summary of all processed policies"""
         categories = {}
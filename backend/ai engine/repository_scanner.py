@@ -5,33 +5,580 @@ Scans repositories using AI-generated compliance rules from policies
 
 import logging
 import os
+import io
+import sys
+import itertools
+import mmap
+import multiprocessing
+import threading
 import json
-from typing import Dict, List, Any, Optional
+import hashlib
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from dataclasses import dataclass, field
 from pathlib import Path
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future
+from collections import deque
 import re
 from datetime import datetime
 import asyncio
+import numpy as np
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+try:
+    from .keyword_matching import build_keyword_automaton, contains_keyword
+except ImportError:
+    from keyword_matching import build_keyword_automaton, contains_keyword
 
 logger = logging.getLogger(__name__)
 
+# Characters that make a scan pattern a regular expression rather than a literal
+_REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+DEFAULT_FILE_EXTENSIONS = ['.py', '.js', '.ts', '.java', '.cpp', '.c', '.cs', '.php', '.rb', '.go']
+
+# Scans with fewer files than this stay in-process; pool start-up would dominate
+PARALLEL_SCAN_MIN_FILES = 64
+
+# Files per task sent to a scan worker, amortizing inter-process overhead
+SCAN_CHUNK_SIZE = 32
+
+# Files at least this large (bytes) are scanned in line-aligned blocks of about STREAM_BLOCK_SIZE characters
+STREAM_SCAN_THRESHOLD = 8 * 1024 * 1024
+STREAM_BLOCK_SIZE = 1024 * 1024
+
+# Files larger than this (bytes) are treated as generated artifacts and skipped during discovery
+MAX_SCAN_BYTES = int(os.getenv("DEVSECOPS_MAX_SCAN_BYTES", str(64 * 1024 * 1024)))
+
+# Per-file results kept between scans, keyed by a hash of the file's content. Opt-in (0 disables it);
+# bounded both by the number of files and by the total number of violations held.
+FILE_RESULT_CACHE_SIZE = int(os.getenv("DEVSECOPS_FILE_RESULT_CACHE_SIZE", "0"))
+FILE_RESULT_CACHE_VIOLATIONS = int(os.getenv("DEVSECOPS_FILE_RESULT_CACHE_VIOLATIONS", "200000"))
+
+# Rule check types that analyze the whole file rather than individual lines
+WHOLE_FILE_CHECK_TYPES = ("function_analysis", "import_analysis")
+
+# Reader threads and how many files may be read ahead of the scanner
+READ_AHEAD_THREADS = 8
+READ_AHEAD_FILES = 64
+
+# Directories holding dependencies, build output or caches; never descended into
+EXCLUDED_DIRECTORIES = frozenset({'node_modules', 'vendor', '.git', 'dist', 'build', '__pycache__', '.venv'})
+
+# Leading characters read to detect binary (any NUL) and minified files
+SNIFF_SIZE = 4096
+MINIFIED_LINE_LENGTH = 500
+
+# Returned by _read_file for files that are not worth scanning
+SKIPPED_FILE = object()
+
+# Files at least this large (bytes) are memory-mapped and checked for any possible match before being decoded
+MMAP_PREFILTER_SIZE = 256 * 1024
+
+# Pattern constructs whose meaning changes when patterns are fused into one alternation (group references)
+_UNFUSABLE_PATTERN = re.compile(r'\\[1-9]|\(\?P=|\(\?\(')
+
+# Constructs that Python's re and Hyperscan's PCRE syntax read differently (anchors, POSIX classes, {,n})
+_HYPERSCAN_UNSAFE_PATTERN = re.compile(r'\\[AZzN]|\[:|\{,')
+
+# Text outside printable ASCII, where re's Unicode classes and case folding differ from Hyperscan's
+_HYPERSCAN_UNSAFE_TEXT = re.compile(r'[^\t\n\x20-\x7e]')
+
+# Bytes that make the mapped prefilter inapplicable: non-ASCII, and CR (text mode rewrites newlines)
+_PREFILTER_UNSAFE_BYTES = re.compile(rb'[\x80-\xff\r]')
+
+# A quantified group that itself ends in a quantifier, e.g. (a+)+ or (\w*,?)*: backtracks exponentially on near-misses.
+# Such scan patterns are matched with RE2 (linear time) when google-re2 is installed.
+_NESTED_QUANTIFIER = re.compile(r'[+*}]\)[+*{]')
+
+# Comment markers recognized by the basic comment check of common languages
+COMMENT_MARKERS = ('#', '//', '/*', '*', '<!--')
+
+# Single-line string literals and comment markers, leftmost first; markers inside a string do not start a comment
+_COMMENT_OR_STRING = re.compile(
+    r'"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|'
+    + '|'.join(re.escape(marker) for marker in sorted(COMMENT_MARKERS, key=len, reverse=True))
+)
+
+# Function definitions of common languages (Python, JavaScript, C/C++/Java/C#) and names needing review.
+# The C-style pattern starts at a word boundary and never backtracks into a name or argument list, so
+# a long identifier run is scanned once instead of once per character (quadratic on minified files).
+_FUNCTION_PATTERNS = tuple(re.compile(pattern, re.MULTILINE) for pattern in (
+    r'def\s+(\w+)\s*\(',
+    r'function\s+(\w+)\s*\(',
+    r'\b(\w++)\s*+\([^)]*+\)\s*+{',
+))
+SENSITIVE_FUNCTION_KEYWORDS = frozenset({"auth", "login", "password", "data", "user"})
+
+# Import statements (Python, Node.js) and potentially problematic modules
+_IMPORT_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'import\s+(\w+)',
+    r'from\s+(\w+)\s+import',
+    r'require\([\'"](\w+)[\'"]\)',
+))
+RISKY_IMPORTS = frozenset({
+    "subprocess", "os.system", "eval", "exec",  # Python security risks
+    "crypto", "hashlib", "ssl",  # Crypto libraries (may need review)
+    "requests", "urllib",  # Network libraries
+    "sqlite3", "mysql", "postgresql"  # Database libraries
+})
+
+# Matched texts shorter than this are interned, so repeated matches share one string
+INTERN_MAX_LENGTH = 64
+
+# Remediation suggestions for well-known scan patterns, keyed by lowercase pattern
+PATTERN_SUGGESTIONS = {
+    "password": "Use environment variables or secure credential management",
+    "pwd": "Use environment variables or secure credential management",
+    "passwd": "Use environment variables or secure credential management",
+    "personal_data": "Implement proper data protection measures (encryption, access controls)",
+    "pii": "Handle personally identifiable information according to privacy regulations",
+    "sensitive": "Apply appropriate security controls for sensitive data",
+    "log": "Ensure audit logging includes necessary compliance information",
+    "audit": "Implement comprehensive audit trails for compliance",
+    "auth": "Use secure authentication mechanisms",
+    "token": "Implement secure token management practices"
+}
+
+# Severity weights used by the compliance score
+SEVERITY_WEIGHTS = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
+
+class ViolationBuffer:
+    """
+    Columnar record of the violations of a scan, for summary statistics
+    
+    The severity, category and file of each violation are interned into integer
+    codes held in typed arrays, so summaries are numpy reductions rather than
+    repeated passes over the violation dicts.
+    """
+    
+    def __init__(self):
+        # Interned values in first-seen order, mapped to their codes
+        self.severities = {}
+        self.categories = {}
+        self.files = {}
+        self.severity_codes = array('h')
+        self.category_codes = array('i')
+    
+    def __len__(self) -> int:
+        return len(self.severity_codes)
+    
+    @staticmethod
+    def _intern(table: Dict[Any, int], value: Any) -> int:
+        code = table.get(value)
+        if code is None:
+            code = table[value] = len(table)
+        return code
+    
+    def append(self, violation: Dict[str, Any]):
+        """Record a single violation"""
+        self.severity_codes.append(self._intern(self.severities, violation.get("severity", "LOW")))
+        self.category_codes.append(self._intern(self.categories, violation.get("category", "unknown")))
+        self._intern(self.files, violation.get("file_path"))
+    
+    def extend(self, violations: List[Dict[str, Any]]):
+        """
+        Record several violations
+        
+        Values are interned once per distinct value and the codes are mapped and
+        appended in bulk, rather than interning violation by violation.
+        """
+        if not violations:
+            return
+        
+        severities = [violation.get("severity", "LOW") for violation in violations]
+        categories = [violation.get("category", "unknown") for violation in violations]
+        self.severity_codes.extend(self._intern_all(self.severities, severities))
+        self.category_codes.extend(self._intern_all(self.categories, categories))
+        self._intern_all(self.files, [violation.get("file_path") for violation in violations])
+    
+    @classmethod
+    def _intern_all(cls, table: Dict[Any, int], values: List[Any]) -> Iterator[int]:
+        for value in dict.fromkeys(values):
+            cls._intern(table, value)
+        return map(table.__getitem__, values)
+    
+    @staticmethod
+    def _counts(codes: array, table: Dict[Any, int], dtype) -> Dict[Any, int]:
+        counts = np.bincount(np.frombuffer(codes, dtype=dtype), minlength=len(table))
+        return {value: int(counts[code]) for value, code in table.items()}
+    
+    def severity_counts(self) -> Dict[str, int]:
+        """Violations per severity, always including HIGH, MEDIUM and LOW"""
+        return {"HIGH": 0, "MEDIUM": 0, "LOW": 0, **self._counts(self.severity_codes, self.severities, np.int16)}
+    
+    def category_counts(self) -> Dict[str, int]:
+        """Violations per category, in first-seen order"""
+        return self._counts(self.category_codes, self.categories, np.int32)
+    
+    def weighted_total(self) -> int:
+        """Sum of the SEVERITY_WEIGHTS of all violations (1 for unknown severities)"""
+        if not len(self):
+            return 0
+        
+        # One counting pass over the codes, then a dot product over the few distinct severities
+        counts = np.bincount(np.frombuffer(self.severity_codes, dtype=np.int16), minlength=len(self.severities))
+        weights = np.array([SEVERITY_WEIGHTS.get(severity, 1) for severity in self.severities], dtype=np.int64)
+        return int(counts @ weights)
+    
+    def summary(self, files_scanned: int) -> Dict[str, Any]:
+        """Summary statistics in the format of RepositoryScanner._calculate_scan_summary"""
+        files_with_violations = len(self.files)
+        return {
+            "total_violations": len(self),
+            "severity_breakdown": self.severity_counts(),
+            "category_breakdown": self.category_counts(),
+            "files_with_violations": files_with_violations,
+            "total_files_scanned": files_scanned,
+            "violation_rate": files_with_violations / max(files_scanned, 1)
+        }
+    
+    def compliance_score(self, files_scanned: int) -> float:
+        """Compliance score (0-1) in the format of RepositoryScanner._calculate_compliance_score"""
+        if files_scanned == 0:
+            return 0.0
+        
+        max_possible_violations = files_scanned * 10  # Assume max 10 violations per file
+        return round(max(0.0, 1.0 - (self.weighted_total() / max_possible_violations)), 3)
+
+
+class ScanTally:
+    """
+    Running counters for a streamed repository scan
+    
+    Produces the same summary and compliance score as a full scan result
+    without keeping the individual violations in memory.
+    """
+    
+    def __init__(self):
+        self.files_scanned = 0
+        self.violations = ViolationBuffer()
+    
+    @property
+    def total_violations(self) -> int:
+        return len(self.violations)
+    
+    def add(self, violation: Dict[str, Any]):
+        """Account for a single violation"""
+        self.violations.append(violation)
+    
+    def summary(self) -> Dict[str, Any]:
+        """Summary statistics in the format of RepositoryScanner._calculate_scan_summary"""
+        return self.violations.summary(self.files_scanned)
+    
+    def compliance_score(self) -> float:
+        """Compliance score (0-1) in the format of RepositoryScanner._calculate_compliance_score"""
+        return self.violations.compliance_score(self.files_scanned)
+
+@dataclass(slots=True)
+class CompiledRule:
+    """Scan-time view of a compliance rule, materialized once per rule set"""
+    index: int
+    key: str
+    rule: Dict[str, Any]
+    rule_id: str
+    category: str
+    severity: str
+    description: str
+    check_type: str
+    scan_patterns: Tuple[str, ...]
+    regexes: Optional[Tuple[Any, ...]]  # re.Pattern, or RE2 for backtracking-prone patterns; None if the rule failed to compile
+    suggestions: Tuple[str, ...]
+
+
+@dataclass(slots=True)
+class CleanFile:
+    """Returned by _read_file for a file in which no scan pattern can match"""
+    file_size: int
+    line_count: int
+
+
+@dataclass(slots=True)
+class FileCtx:
+    """
+    Content of a file (or a line-aligned block of it) shared by every analyzer of one scan
+    
+    The ASCII encoding of the text and its newline index are computed on first
+    use and then reused by the literal scan, line selection and comment checks,
+    instead of each of them encoding the text again.
+    """
+    path: Path
+    text: str
+    line_offset: int = 0
+    path_text: str = field(init=False)
+    _buffer: Optional[np.ndarray] = field(default=None, init=False)
+    _newlines: Optional[np.ndarray] = field(default=None, init=False)
+    
+    def __post_init__(self):
+        self.path_text = _path_text(self.path)
+    
+    def buffer(self) -> np.ndarray:
+        """Bytes of the (ASCII) text as a uint8 array, where byte offsets equal character offsets"""
+        if self._buffer is None:
+            self._buffer = _ascii_buffer(self.text)
+        return self._buffer
+    
+    def newlines(self) -> np.ndarray:
+        """Offsets of the newlines in the (ASCII) text"""
+        if self._newlines is None:
+            self._newlines = np.flatnonzero(self.buffer() == 0x0A)
+        return self._newlines
+
+
+_SENSITIVE_FUNCTION_AUTOMATON = build_keyword_automaton(SENSITIVE_FUNCTION_KEYWORDS)
+_RISKY_IMPORT_AUTOMATON = build_keyword_automaton(RISKY_IMPORTS)
+
+
+def _path_text(file_path: Path) -> str:
+    """File path string shared by all violations and results of a file"""
+    return sys.intern(str(file_path))
+
+
+def _share_text(text: str) -> str:
+    """Intern short matched texts; violations of common patterns repeat the same few strings"""
+    return sys.intern(text) if len(text) < INTERN_MAX_LENGTH else text
+
+
+def _ascii_buffer(content: str) -> np.ndarray:
+    """Bytes of ASCII content as a uint8 array, where byte offsets equal character offsets"""
+    return np.frombuffer(content.encode('ascii'), dtype=np.uint8)
+
+
+def _line_positions(newlines: np.ndarray, offsets) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Map offsets into a text to arrays of (0-based line index, line start offset)
+    
+    All offsets are placed with one binary search call in the text's newline
+    index (see FileCtx.newlines), without splitting the content into lines.
+    """
+    line_indices = np.searchsorted(newlines, offsets)
+    if not newlines.size:
+        return line_indices, np.zeros(len(line_indices), dtype=np.intp)
+    
+    # Gather only the starts of lines holding an offset, without a file-sized array of line starts
+    previous_newlines = newlines[np.maximum(line_indices - 1, 0)]
+    line_starts = np.where(line_indices > 0, previous_newlines + 1, 0)
+    return line_indices, line_starts
+
+
+def _comment_flags(buffer: np.ndarray, offsets: np.ndarray, line_starts: np.ndarray) -> List[bool]:
+    """
+    Whether each offset into an _ascii_buffer follows a comment marker on its line
+    
+    Vectorized form of _comment_column: the end of every COMMENT_MARKERS occurrence
+    is located with array compares, and an offset is in a comment if the first
+    marker ending after its line start ends at or before it.
+    """
+    size = len(buffer)
+    marker_ends = [np.empty(0, dtype=np.intp)]
+    first_char_positions = {}
+    for marker in COMMENT_MARKERS:
+        codes = marker.encode('ascii')
+        width = len(codes)
+        
+        # One full pass per distinct first character; later characters are only checked at its positions
+        positions = first_char_positions.get(codes[0])
+        if positions is None:
+            positions = first_char_positions[codes[0]] = np.flatnonzero(buffer == codes[0])
+        positions = positions[positions <= size - width]
+        for k in range(1, width):
+            positions = positions[buffer[positions + k] == codes[k]]
+        marker_ends.append(positions + width)
+    
+    # Markers contain no newline, so the first end after a line start belongs to that line
+    marker_ends = np.sort(np.concatenate(marker_ends))
+    first_ends = np.append(marker_ends, size + 1)[np.searchsorted(marker_ends, line_starts + 1)]
+    return (first_ends <= offsets).tolist()
+
+
+def _comment_column(line: str) -> int:
+    """
+    Column at which the first comment marker of line ends (basic check for common languages)
+    
+    A match starting at or after this column is treated as commented out;
+    len(line) + 1 if the line has no marker. Markers inside a quoted string on
+    the same line are skipped in one left-to-right pass over the line.
+    """
+    if '"' in line or "'" in line:
+        for token in _COMMENT_OR_STRING.finditer(line):
+            if token.group()[0] not in '"\'':
+                return token.end()
+        return len(line) + 1
+    
+    column = len(line) + 1
+    for marker in COMMENT_MARKERS:
+        index = line.find(marker)
+        if index != -1 and index + len(marker) < column:
+            column = index + len(marker)
+    return column
+
+
+def _iter_file_entries(root, excluded_dirs=frozenset()) -> Iterator[os.DirEntry]:
+    """Yield the files below root in one os.scandir walk, using dirent types instead of a stat per entry"""
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in excluded_dirs:
+                            pending.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+        except OSError as e:
+            logger.warning(f"Could not list directory {directory}: {e}")
+
+
+def _content_key(file_path: Path) -> Optional[bytes]:
+    """Hash of a file's bytes, or None if it cannot be read"""
+    try:
+        with open(file_path, 'rb') as f:
+            return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=20)).digest()
+    except OSError:
+        return None
+
+
+def _copy_file_results(file_results: Optional[Dict[str, Any]], path_text: str) -> Optional[Dict[str, Any]]:
+    """
+    Copy of cached file results for a file at path_text, with their own lists
+    
+    Results are cached by content, so they may have been found for a file at
+    another path (another clone of the same repository); violations are then
+    copied with the new path, otherwise the violation dicts are shared.
+    """
+    if file_results is None:
+        return None
+    if file_results["file_path"] == path_text:
+        violations = list(file_results["violations"])
+    else:
+        violations = [{**violation, "file_path": path_text} for violation in file_results["violations"]]
+    return {
+        **file_results,
+        "file_path": path_text,
+        "violations": violations,
+        "compliance_checks": list(file_results["compliance_checks"])
+    }
+
+
+def _is_binary_or_minified(head: str) -> bool:
+    """Whether the leading characters of a file look like binary data or a minified bundle"""
+    if '\x00' in head:
+        return True
+    return len(head) > MINIFIED_LINE_LENGTH * (head.count('\n') + 1)
+
+
+# Compiled rule sets by rules fingerprint, shared by scanners with the same rules. The cache is
+# per process: it only saves work when the same rules are compiled again in one process, and each
+# scan worker compiles its own copy in _init_scan_worker
+COMPILED_RULE_CACHE_SIZE = 8
+_compiled_rule_sets: Dict[bytes, Tuple[Any, ...]] = {}
+_compiled_rule_sets_lock = threading.Lock()
+
+# Scanner attributes produced by RepositoryScanner._compile_rule_set
+_COMPILED_ATTRIBUTES = (
+    '_compiled_rules', '_literal_automaton', '_literal_slots', '_needs_line_scan',
+    '_line_prefilter', '_full_line_prefilter', '_line_database', '_full_line_database',
+    '_streamable', '_byte_prefilter'
+)
+
+
+def _rules_fingerprint(compliance_rules: Dict[str, Any]) -> Optional[bytes]:
+    """Digest of a rule set in rule order, or None if the rules cannot be serialized"""
+    try:
+        serialized = json.dumps(list(compliance_rules.items()), sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(serialized.encode('utf-8'), digest_size=16).digest()
+
+
+# Start method of scan worker processes. Forking the threaded API server could copy a lock held by
+# another thread (logging, allocator) into a worker and deadlock it; workers get their rules through
+# _init_scan_worker, so nothing depends on inheriting the parent's state.
+SCAN_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Scanner used by pool worker processes, built once per worker by _init_scan_worker
+_worker_scanner = None
+
+
+def _init_scan_worker(compliance_rules: Dict[str, Any]):
+    """Build the worker's scanner from the parent's rules, compiling them once per process"""
+    global _worker_scanner
+    _worker_scanner = RepositoryScanner(compliance_rules=compliance_rules, max_workers=1)
+
+
+def _scan_file_batch(file_paths: List[Path]) -> List[Tuple[Path, Optional[Dict[str, Any]], Optional[str]]]:
+    """Scan a chunk of files in a worker process"""
+    return list(_worker_scanner._scan_paths(file_paths))
+
+
 class RepositoryScanner:
     """
     Scans repositories for compliance violations using AI-generated rules
     """
     
-    def __init__(self, policy_processor=None):
+    def __init__(self, policy_processor=None, compliance_rules: Optional[Dict[str, Any]] = None,
+                 max_workers: Optional[int] = None):
         """
         Initialize repository scanner
         
         Args:
             policy_processor: PolicyProcessor instance for accessing compliance rules
+            compliance_rules: Rules to scan with directly, instead of loading them
+            max_workers: Worker processes for large scans (default: CPU count, 1 = scan in-process)
         """
         self.policy_processor = policy_processor
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.compliance_rules = {}
         self.scan_patterns = {}
         self.scan_results = {}
         
-        self._load_compliance_rules()
+        # Per-rule compiled patterns and the fused literal-pattern automaton, see _compile_rules
+        self._rules_fingerprint = None
+        self._compiled_rules = []
+        self._literal_automaton = None
+        self._literal_slots = {}
+        self._needs_line_scan = True
+        self._line_prefilter = None
+        self._full_line_prefilter = None
+        self._line_database = None
+        self._full_line_database = None
+        self._streamable = True
+        self._byte_prefilter = None
+        
+        # Worker processes kept across scans; they compile this scanner's rules once, see _get_scan_pool
+        self._scan_pool = None
+        self._scan_pool_lock = threading.Lock()
+        
+        # Results of previously scanned files by content hash, and the violations they hold, see _scan_files
+        self._file_results = {}
+        self._file_results_violations = 0
+        self._file_results_lock = threading.Lock()
+        
+        if compliance_rules is not None:
+            self.compliance_rules = compliance_rules
+            self._compile_rules()
+        else:
+            self._load_compliance_rules()
     
     def _load_compliance_rules(self):
         """Load compliance rules from policy processor"""
@@ -43,6 +590,294 @@ class RepositoryScanner:
         else:
             logger.warning("No policy processor available, using default rules")
             self._load_default_rules()
+        
+        self._compile_rules()
+    
+    def _compile_rules(self):
+        """
+        Precompile scan patterns once per rule set
+        
+        Reloading unchanged rules keeps the current compiled state, and a rule set
+        already compiled by another scanner in this process is reused from
+        _compiled_rule_sets instead of being compiled again.
+        """
+        fingerprint = _rules_fingerprint(self.compliance_rules)
+        if fingerprint is not None and fingerprint == self._rules_fingerprint:
+            return
+        
+        # Workers hold the rules they were started with, and cached file results were found with the old rules
+        self.close()
+        self.clear_file_cache()
+        self._rules_fingerprint = fingerprint
+        
+        with _compiled_rule_sets_lock:
+            compiled_state = _compiled_rule_sets.get(fingerprint) if fingerprint is not None else None
+        if compiled_state is not None:
+            for name, value in zip(_COMPILED_ATTRIBUTES, compiled_state):
+                setattr(self, name, value)
+            return
+        
+        self._compile_rule_set()
+        if fingerprint is None:
+            return
+        
+        with _compiled_rule_sets_lock:
+            if len(_compiled_rule_sets) >= COMPILED_RULE_CACHE_SIZE:
+                del _compiled_rule_sets[next(iter(_compiled_rule_sets))]
+            _compiled_rule_sets[fingerprint] = tuple(getattr(self, name) for name in _COMPILED_ATTRIBUTES)
+    
+    def _compile_rule_set(self):
+        """
+        Compile the scan patterns of the current rules
+        
+        Literal patterns are fused into a single Aho-Corasick automaton keyed by
+        (rule index, pattern index) slots, so each file is scanned once for all of
+        them. Regex patterns, and every pattern when pyahocorasick is missing, keep
+        a compiled case-insensitive regex applied line by line.
+        """
+        self._compiled_rules = []
+        self._literal_slots = {}
+        automaton = ahocorasick.Automaton() if AHOCORASICK_AVAILABLE else None
+        
+        for rule_index, (rule_key, rule) in enumerate(self.compliance_rules.items()):
+            compiled = CompiledRule(
+                index=rule_index,
+                key=rule_key,
+                rule=rule,
+                rule_id=rule.get("rule_id", "unknown"),
+                category=rule.get("category", "unknown"),
+                severity=rule.get("severity", "MEDIUM"),
+                description=rule.get("description", "Compliance rule violation"),
+                check_type=(rule.get("compliance_check") or {}).get("check_type", "pattern_match"),
+                scan_patterns=tuple(rule.get("scan_patterns", [])),
+                regexes=None,
+                suggestions=()
+            )
+            self._compiled_rules.append(compiled)
+            
+            try:
+                regexes = []
+                for pattern in compiled.scan_patterns:
+                    try:
+                        regex = re.compile(pattern, re.IGNORECASE)
+                        if _NESTED_QUANTIFIER.search(pattern):
+                            regex = self._compile_linear_regex(pattern, compiled.rule_id) or regex
+                        regexes.append(regex)
+                    except re.error:
+                        # If pattern is not valid regex, treat as literal string
+                        regexes.append(re.compile(re.escape(pattern), re.IGNORECASE))
+                compiled.suggestions = tuple(
+                    self._generate_suggestion(pattern, compiled.category) for pattern in compiled.scan_patterns
+                )
+                compiled.regexes = tuple(regexes)
+            except Exception as e:
+                logger.error(f"Rule compilation failed for {compiled.rule_id}: {e}")
+                continue
+            
+            if automaton is None:
+                continue
+            
+            for pattern_index, (pattern, regex) in enumerate(zip(compiled.scan_patterns, compiled.regexes)):
+                # Lowercased ASCII literals match exactly like the IGNORECASE regex
+                is_literal = regex.pattern != pattern or not _REGEX_METACHARACTERS.intersection(pattern)
+                if is_literal and pattern and pattern.isascii() and '\n' not in pattern:
+                    slot = (rule_index, pattern_index)
+                    key = pattern.lower()
+                    if key not in automaton:
+                        automaton.add_word(key, (len(key), []))
+                    automaton.get(key)[1].append(slot)
+                    self._literal_slots[slot] = (compiled, compiled.suggestions[pattern_index])
+        
+        if automaton is not None and len(automaton) > 0:
+            automaton.make_automaton()
+            self._literal_automaton = automaton
+        else:
+            self._literal_automaton = None
+        
+        # Files can be scanned block by block only if every check is line-local
+        self._streamable = all(
+            compiled.check_type not in WHOLE_FILE_CHECK_TYPES
+            for compiled in self._compiled_rules if compiled.regexes is not None
+        )
+        
+        # Whether any pattern still needs the line-by-line regex scan
+        self._needs_line_scan = any(
+            (compiled.index, pattern_index) not in self._literal_slots
+            for compiled in self._compiled_rules if compiled.regexes
+            for pattern_index in range(len(compiled.regexes))
+        )
+        
+        # Fused regexes selecting the lines any line-scanned pattern can match, for files with
+        # and without a fused literal scan
+        active_regexes = [
+            (compiled.index, pattern_index, regex)
+            for compiled in self._compiled_rules if compiled.regexes
+            for pattern_index, regex in enumerate(compiled.regexes)
+        ]
+        line_scanned = [
+            regex for rule_index, pattern_index, regex in active_regexes
+            if (rule_index, pattern_index) not in self._literal_slots
+        ]
+        all_regexes = [regex for _, _, regex in active_regexes]
+        self._line_prefilter = self._build_line_prefilter(line_scanned)
+        self._full_line_prefilter = self._build_line_prefilter(all_regexes)
+        self._line_database = self._build_line_database(line_scanned)
+        self._full_line_database = self._build_line_database(all_regexes)
+        
+        # A byte regex over all patterns can rule out whole files only when every rule is a
+        # line-local scan for non-empty ASCII literals, all of which are then in the automaton
+        active_rules = [compiled for compiled in self._compiled_rules if compiled.regexes is not None]
+        literal_patterns = {
+            compiled.scan_patterns[pattern_index].lower()
+            for compiled in active_rules for pattern_index in range(len(compiled.regexes))
+        }
+        if self._streamable and not self._needs_line_scan and self._literal_automaton is not None and literal_patterns:
+            self._byte_prefilter = re.compile(
+                b'|'.join(re.escape(pattern.encode('ascii')) for pattern in sorted(literal_patterns)),
+                re.IGNORECASE
+            )
+        else:
+            self._byte_prefilter = None
+    
+    def _compile_linear_regex(self, pattern: str, rule_id: str) -> Optional[Any]:
+        """
+        Compile a backtracking-prone scan pattern with RE2
+        
+        RE2 matches in time linear in the line length whatever the pattern. Its
+        classes (\\w, \\b, \\s) are ASCII-only, which only matters on non-ASCII lines.
+        
+        Returns:
+            The case-insensitive RE2 regex (same search API as re), or None to keep
+            Python's re when RE2 is missing or rejects the pattern (back-references, lookaround)
+        """
+        if RE2_AVAILABLE:
+            try:
+                options = re2.Options()
+                options.case_sensitive = False
+                return re2.compile(pattern, options)
+            except Exception as e:
+                logger.debug(f"RE2 cannot compile scan pattern {pattern!r}: {e}")
+        
+        logger.warning(f"Scan pattern {pattern!r} of {rule_id} nests quantifiers and may backtrack "
+                       f"catastrophically on some lines; install google-re2 to match it in linear time")
+        return None
+    
+    def _build_line_prefilter(self, regexes: List[Any]) -> Optional[re.Pattern]:
+        """
+        Fuse case-insensitive patterns into one alternation that matches a line iff one of them does
+        
+        Returns:
+            The fused regex, or None if there is nothing to fuse or the patterns
+            cannot be combined without changing their meaning (or, for RE2-matched
+            patterns, without bringing back their backtracking)
+        """
+        sources = list(dict.fromkeys(regex.pattern for regex in regexes))
+        if not sources or any(_UNFUSABLE_PATTERN.search(source) for source in sources):
+            return None
+        if any(not isinstance(regex, re.Pattern) for regex in regexes):
+            return None
+        try:
+            return re.compile('|'.join(f'(?:{source})' for source in sources), re.IGNORECASE)
+        except re.error:
+            return None
+    
+    def _build_line_database(self, regexes: List[re.Pattern]) -> Optional[Any]:
+        """
+        Compile patterns into a Hyperscan database reporting every match end in a text
+        
+        Returns:
+            The database, or None if hyperscan is missing or a pattern is not
+            supported with the same meaning (back-references, lookaround, empty matches)
+        """
+        if not HYPERSCAN_AVAILABLE:
+            return None
+        
+        sources = list(dict.fromkeys(regex.pattern for regex in regexes))
+        if not sources or any(
+            not source.isascii() or _UNFUSABLE_PATTERN.search(source) or _HYPERSCAN_UNSAFE_PATTERN.search(source)
+            for source in sources
+        ):
+            return None
+        
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[source.encode('ascii') for source in sources],
+                ids=list(range(len(sources))),
+                elements=len(sources),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE] * len(sources)
+            )
+            return database
+        except Exception as e:
+            logger.debug(f"Hyperscan cannot compile scan patterns, using re: {e}")
+            return None
+    
+    def _database_lines(self, database: Any, ctx: FileCtx) -> Optional[List[Tuple[int, str]]]:
+        """
+        Lines of the context's text in which a pattern of database ends a match
+        
+        Lines are sliced out of text through the vectorized newline index, so
+        text is never split into a list of all its lines.
+        
+        Returns:
+            (1-based line number, line, comment column) triples, or None if the scan failed
+        """
+        match_ends = []
+        
+        def on_match(pattern_id, start, end, flags, context):
+            match_ends.append(end - 1)
+        
+        try:
+            database.scan(ctx.buffer(), match_event_handler=on_match)
+        except Exception as e:
+            logger.debug(f"Hyperscan scan failed, using re: {e}")
+            return None
+        
+        if not match_ends:
+            return []
+        
+        text = ctx.text
+        candidates = {}
+        line_indices, line_starts = _line_positions(ctx.newlines(), match_ends)
+        for line_index, line_start in zip(line_indices.tolist(), line_starts.tolist()):
+            if line_index not in candidates:
+                line_end = text.find('\n', line_start)
+                candidates[line_index] = text[line_start:line_end if line_end != -1 else len(text)]
+        return [
+            (ctx.line_offset + line_index + 1, line, _comment_column(line))
+            for line_index, line in sorted(candidates.items())
+        ]
+    
+    def _line_candidates(self, ctx: FileCtx,
+                         literal_hits: Optional[Dict[Tuple[int, int], List[Dict[str, Any]]]]) -> List[Tuple[int, str, int]]:
+        """
+        Select the lines that line-scanned patterns need to visit
+        
+        With Hyperscan, one DFA pass over the whole text finds the lines containing
+        matches. Otherwise one fused search per line rules out lines that no pattern
+        matches. Either way each pattern only runs over the remaining candidates.
+        
+        Args:
+            ctx: File content (or a line-aligned block of it)
+            literal_hits: Result of _scan_literal_patterns for ctx
+        
+        Returns:
+            (1-based line number, line, comment column) triples; the comment column
+            is computed once per line for all patterns, see _comment_column
+        """
+        text = ctx.text
+        database = self._full_line_database if literal_hits is None else self._line_database
+        if database is not None and not _HYPERSCAN_UNSAFE_TEXT.search(text):
+            candidates = self._database_lines(database, ctx)
+            if candidates is not None:
+                return candidates
+        
+        prefilter = self._full_line_prefilter if literal_hits is None else self._line_prefilter
+        numbered = enumerate(text.split('\n'), ctx.line_offset + 1)
+        if prefilter is None:
+            return [(line_num, line, _comment_column(line)) for line_num, line in numbered]
+        search = prefilter.search
+        return [(line_num, line, _comment_column(line)) for line_num, line in numbered if search(line)]
     
     def _load_default_rules(self):
         """Load default compliance rules when policy processor is unavailable"""
@@ -93,7 +928,7 @@ class RepositoryScanner:
         scan_start = datetime.now()
         
         if file_extensions is None:
-            file_extensions = ['.py', '.js', '.ts', '.java', '.cpp', '.c', '.cs', '.php', '.rb', '.go']
+            file_extensions = DEFAULT_FILE_EXTENSIONS
         
         results = {
             "repository_path": repo_path,
@@ -108,36 +943,27 @@ class RepositoryScanner:
         
         try:
             repo_path = Path(repo_path)
-            if not repo_path.exists():
-                raise FileNotFoundError(f"Repository path not found: {repo_path}")
-            
-            # Find all code files
-            code_files = []
-            for ext in file_extensions:
-                code_files.extend(repo_path.rglob(f'*{ext}'))
+            code_files = self._find_code_files(repo_path, file_extensions)
             
             logger.info(f"Scanning {len(code_files)} files in {repo_path}")
             
-            # Scan each file
-            for file_path in code_files:
-                try:
-                    file_results = self._scan_file(file_path)
-                    if file_results:
-                        results["scanned_files"].append(file_results)
-                        results["violations"].extend(file_results.get("violations", []))
-                        
-                except Exception as e:
-                    logger.error(f"Failed to scan file {file_path}: {e}")
-                    results["violations"].append({
-                        "file_path": str(file_path),
-                        "violation_type": "scan_error",
-                        "message": f"Failed to scan file: {str(e)}",
-                        "severity": "LOW"
-                    })
+            # Scan each file, recording violations in columns for the summary as well
+            violation_buffer = ViolationBuffer()
+            for file_path, file_results, error in self._scan_files(code_files):
+                if error is not None:
+                    logger.error(f"Failed to scan file {file_path}: {error}")
+                    scan_error = self._scan_error(file_path, error)
+                    results["violations"].append(scan_error)
+                    violation_buffer.append(scan_error)
+                elif file_results:
+                    file_violations = file_results.get("violations", [])
+                    results["scanned_files"].append(file_results)
+                    results["violations"].extend(file_violations)
+                    violation_buffer.extend(file_violations)
             
             # Calculate compliance metrics
-            results["scan_summary"] = self._calculate_scan_summary(results)
-            results["compliance_score"] = self._calculate_compliance_score(results)
+            results["scan_summary"] = self._calculate_scan_summary(results, violation_buffer)
+            results["compliance_score"] = self._calculate_compliance_score(results, violation_buffer)
             
             # Calculate scan duration
             scan_end = datetime.now()
@@ -155,180 +981,591 @@ class RepositoryScanner:
                 "scan_duration": (datetime.now() - scan_start).total_seconds()
             }
     
-    def _scan_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
+    def scan_repository_iter(self, repo_path: str, file_extensions: List[str] = None,
+                             tally: Optional[ScanTally] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Scan repository and yield violations one file at a time
+        
+        Args:
+            repo_path: Path to repository root
+            file_extensions: File extensions to scan (default: common code files)
+            tally: Optional ScanTally whose files_scanned counter is updated as files are scanned
+            
+        Yields:
+            Individual violation dicts, in the same format as scan_repository
+        """
+        if file_extensions is None:
+            file_extensions = DEFAULT_FILE_EXTENSIONS
+        
+        code_files = self._find_code_files(Path(repo_path), file_extensions)
+        logger.info(f"Scanning {len(code_files)} files in {repo_path}")
+        
+        for file_path, file_results, error in self._scan_files(code_files):
+            if error is not None:
+                logger.error(f"Failed to scan file {file_path}: {error}")
+                yield self._scan_error(file_path, error)
+                continue
+            
+            if file_results:
+                if tally is not None:
+                    tally.files_scanned += 1
+                yield from file_results.get("violations", [])
+    
+    def _scan_files(self, code_files: List[Path]) -> Iterator[Tuple[Path, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Scan files in input order, reusing the results of files whose content was scanned before
+        
+        With the file result cache enabled (FILE_RESULT_CACHE_SIZE), every file is
+        hashed first and only files whose content hash is not cached are scanned.
+        The hash, not the modification time, decides: a file rewritten in place
+        is always rescanned, and identical files in a fresh clone hit the cache.
+        
+        Yields:
+            (file_path, file_results, error) for each file; error is the exception
+            message if scanning raised, file_results is None if the file was skipped
+        """
+        if FILE_RESULT_CACHE_SIZE <= 0:
+            yield from self._scan_changed_files(code_files)
+            return
+        
+        # hashlib releases the GIL on large buffers, so files are hashed by the reader threads
+        with ThreadPoolExecutor(max_workers=READ_AHEAD_THREADS) as readers:
+            content_keys = list(readers.map(_content_key, code_files))
+        
+        not_cached = object()
+        changed_files = []
+        cached_results = []
+        with self._file_results_lock:
+            for file_path, content_key in zip(code_files, content_keys):
+                cached = self._file_results.get(content_key, not_cached) if content_key is not None else not_cached
+                cached_results.append(cached)
+                if cached is not_cached:
+                    changed_files.append(file_path)
+        
+        scanned = self._scan_changed_files(changed_files)
+        for file_path, content_key, cached in zip(code_files, content_keys, cached_results):
+            if cached is not not_cached:
+                yield file_path, _copy_file_results(cached, _path_text(file_path)), None
+                continue
+            
+            file_path, file_results, error = next(scanned)
+            if error is None and content_key is not None:
+                self._cache_file_results(content_key, file_results)
+            yield file_path, file_results, error
+    
+    def _cache_file_results(self, content_key: bytes, file_results: Optional[Dict[str, Any]]):
+        """
+        Remember the results for a file content, dropping the oldest entries once
+        FILE_RESULT_CACHE_SIZE files or FILE_RESULT_CACHE_VIOLATIONS violations are held
+        """
+        violation_count = len(file_results["violations"]) if file_results is not None else 0
+        if violation_count > FILE_RESULT_CACHE_VIOLATIONS:
+            return
+        
+        with self._file_results_lock:
+            previous = self._file_results.pop(content_key, None)
+            if previous is not None:
+                self._file_results_violations -= len(previous["violations"])
+            while self._file_results and (
+                len(self._file_results) >= FILE_RESULT_CACHE_SIZE
+                or self._file_results_violations + violation_count > FILE_RESULT_CACHE_VIOLATIONS
+            ):
+                oldest = self._file_results.pop(next(iter(self._file_results)))
+                if oldest is not None:
+                    self._file_results_violations -= len(oldest["violations"])
+            self._file_results[content_key] = file_results
+            self._file_results_violations += violation_count
+    
+    def clear_file_cache(self):
+        """Forget the per-file results of previous scans"""
+        with self._file_results_lock:
+            self._file_results = {}
+            self._file_results_violations = 0
+    
+    def _scan_changed_files(self, code_files: List[Path]) -> Iterator[Tuple[Path, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Scan files in input order, in a process pool when the scan is large enough
+        
+        Yields:
+            (file_path, file_results, error) for each file, see _scan_files
+        """
+        if self.max_workers <= 1 or len(code_files) < PARALLEL_SCAN_MIN_FILES:
+            yield from self._scan_paths(code_files)
+            return
+        
+        chunks = [code_files[i:i + SCAN_CHUNK_SIZE] for i in range(0, len(code_files), SCAN_CHUNK_SIZE)]
+        logger.info(f"Scanning {len(code_files)} files with up to {min(self.max_workers, len(chunks))} worker processes")
+        
+        done = 0
+        try:
+            for batch in self._get_scan_pool().map(_scan_file_batch, chunks):
+                yield from batch
+                done += 1
+        except Exception as e:
+            logger.warning(f"Parallel scan failed, scanning remaining files in-process: {e}")
+            self.close()
+            for chunk in chunks[done:]:
+                yield from self._scan_paths(chunk)
+    
+    def _get_scan_pool(self) -> ProcessPoolExecutor:
+        """
+        Process pool shared by this scanner's parallel scans
+        
+        Rules are sent once per worker through the initializer, not with every
+        chunk, and workers stay alive between scans so repeated scans skip
+        process start-up and rule compilation.
+        """
+        with self._scan_pool_lock:
+            if self._scan_pool is None:
+                self._scan_pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=SCAN_POOL_CONTEXT,
+                    initializer=_init_scan_worker,
+                    initargs=(self.compliance_rules,)
+                )
+            return self._scan_pool
+    
+    def close(self):
+        """Shut down the scan worker processes, if any were started"""
+        with self._scan_pool_lock:
+            pool, self._scan_pool = self._scan_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _scan_paths(self, file_paths: List[Path]) -> Iterator[Tuple[Path, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Scan files in order while reader threads fetch the following files
+        
+        File reads release the GIL, so disk latency overlaps with pattern matching.
+        At most READ_AHEAD_FILES contents are held in memory ahead of the scanner.
+        """
+        if len(file_paths) <= 1:
+            for file_path in file_paths:
+                yield self._scan_file_guarded(file_path)
+            return
+        
+        with ThreadPoolExecutor(max_workers=READ_AHEAD_THREADS) as readers:
+            pending = deque()
+            paths = iter(file_paths)
+            for file_path in paths:
+                pending.append((file_path, readers.submit(self._read_file, file_path)))
+                if len(pending) >= READ_AHEAD_FILES:
+                    break
+            
+            while pending:
+                file_path, content = pending.popleft()
+                next_path = next(paths, None)
+                if next_path is not None:
+                    pending.append((next_path, readers.submit(self._read_file, next_path)))
+                yield self._scan_file_guarded(file_path, content)
+    
+    def _scan_file_guarded(self, file_path: Path,
+                           content: Optional[Future] = None) -> Tuple[Path, Optional[Dict[str, Any]], Optional[str]]:
+        """Scan a file, capturing any exception as an error message"""
+        try:
+            return file_path, self._scan_file(file_path, content), None
+        except Exception as e:
+            return file_path, None, str(e)
+    
+    def _read_file(self, file_path: Path) -> Any:
+        """
+        Read a source file as text
+        
+        Returns:
+            File content, None if it is large enough to be scanned in blocks,
+            SKIPPED_FILE if it looks binary or minified, or a CleanFile if no
+            pattern can match it
+        """
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            head = f.read(SNIFF_SIZE)
+            if _is_binary_or_minified(head):
+                logger.debug(f"Skipping binary or minified file {file_path}")
+                return SKIPPED_FILE
+            if len(head) < SNIFF_SIZE:
+                return head
+            
+            file_size = os.fstat(f.fileno()).st_size
+            if self._byte_prefilter is not None and file_size >= MMAP_PREFILTER_SIZE:
+                clean_file = self._prefilter_mapped(f.fileno())
+                if clean_file is not None:
+                    return clean_file
+            
+            if self._streamable and file_size >= STREAM_SCAN_THRESHOLD:
+                return None
+            f.seek(0)
+            return f.read()
+    
+    def _prefilter_mapped(self, fileno: int) -> Optional[CleanFile]:
+        """
+        Check a memory-mapped file for any possible match without copying or decoding it
+        
+        The kernel pages the file in as the regex engine walks it. Only pure ASCII
+        files without CR are decided here, since their bytes are exactly the text
+        the scan would see.
+        
+        Returns:
+            CleanFile if no pattern occurs in the file, None if it must be scanned
+        """
+        with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            if _PREFILTER_UNSAFE_BYTES.search(mapped) or self._byte_prefilter.search(mapped):
+                return None
+            
+            file_bytes = np.frombuffer(mapped, dtype=np.uint8)
+            newline_count = int(np.count_nonzero(file_bytes == 0x0A))
+            del file_bytes  # release the buffer export before the map is closed
+            return CleanFile(file_size=len(mapped), line_count=newline_count + 1)
+    
+    def _scan_error(self, file_path: Path, error: str) -> Dict[str, Any]:
+        """Violation entry recorded for a file that could not be scanned"""
+        return {
+            "file_path": _path_text(file_path),
+            "violation_type": "scan_error",
+            "message": f"Failed to scan file: {error}",
+            "severity": "LOW"
+        }
+    
+    def _find_code_files(self, repo_path: Path, file_extensions: List[str]) -> List[Path]:
+        """Find all files under repo_path with one of the given extensions"""
+        if not repo_path.exists():
+            raise FileNotFoundError(f"Repository path not found: {repo_path}")
+        
+        # A single walk of the tree, filtering suffixes in the loop instead of one rglob pass per extension;
+        # dependency and build directories are pruned without being listed
+        suffixes = tuple(file_extensions)
+        code_files = []
+        for entry in _iter_file_entries(repo_path, EXCLUDED_DIRECTORIES):
+            if not entry.name.endswith(suffixes):
+                continue
+            # Only matching files pay for a stat; oversized artifacts never reach a reader thread
+            if entry.stat().st_size > MAX_SCAN_BYTES:
+                logger.debug(f"Skipping oversized file {entry.path}")
+                continue
+            code_files.append(Path(entry.path))
+        return code_files
+    
+    def _scan_file(self, file_path: Path, pending_content: Optional[Future] = None) -> Optional[Dict[str, Any]]:
         """
         Scan individual file for compliance violations
         
         Args:
             file_path: Path to file to scan
+            pending_content: Optional future of a read-ahead _read_file(file_path)
             
         Returns:
             File scan results or None if file couldn't be scanned
         """
         try:
             # Read file content
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            file_results = {
-                "file_path": str(file_path),
-                "file_size": len(content),
-                "line_count": len(content.split('\n')),
-                "violations": [],
-                "compliance_checks": []
-            }
+            if pending_content is not None:
+                content = pending_content.result()
+            else:
+                content = self._read_file(file_path)
+            
+            if content is SKIPPED_FILE:
+                return None
+            if isinstance(content, CleanFile):
+                return self._build_file_results(
+                    file_path, content.file_size, content.line_count, [[] for _ in self._compiled_rules]
+                )
+            if content is None:
+                return self._scan_file_streamed(file_path)
+            
+            ctx = FileCtx(file_path, content)
+            
+            # One pass over the file for all literal patterns of all rules
+            literal_hits = self._scan_literal_patterns(ctx)
+            
+            # Lines are only materialized for patterns scanned line by line
+            if literal_hits is None or self._needs_line_scan:
+                lines = self._line_candidates(ctx, literal_hits)
+            else:
+                lines = None
             
             # Apply each compliance rule
-            for rule_id, rule in self.compliance_rules.items():
-                violations = self._apply_rule_to_file(content, file_path, rule)
-                file_results["violations"].extend(violations)
-                
-                # Record compliance check
-                file_results["compliance_checks"].append({
-                    "rule_id": rule_id,
-                    "violations_found": len(violations),
-                    "category": rule.get("category", "unknown")
-                })
+            rule_violations = [
+                self._apply_rule_to_file(ctx, lines, compiled, literal_hits)
+                for compiled in self._compiled_rules
+            ]
             
-            return file_results
+            return self._build_file_results(file_path, len(content), content.count('\n') + 1, rule_violations)
             
         except Exception as e:
             logger.error(f"File scan failed for {file_path}: {e}")
             return None
     
-    def _apply_rule_to_file(self, content: str, file_path: Path, rule: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _scan_file_streamed(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Scan a large file in line-aligned blocks, holding one or two blocks in memory at a time
+        
+        Only used when every rule is line-local, so scanning block by block finds
+        exactly the violations of a whole-file scan. They are merged per pattern to
+        keep the same order.
+        """
+        # Violations per rule and pattern, accumulated over the blocks
+        pattern_violations = [[[] for _ in (compiled.regexes or ())] for compiled in self._compiled_rules]
+        failed_rules = set()
+        file_size = 0
+        newline_count = 0
+        
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            block = ''.join(f.readlines(STREAM_BLOCK_SIZE))
+            while True:
+                next_block = ''.join(f.readlines(STREAM_BLOCK_SIZE))
+                is_last = not next_block
+                if not is_last:
+                    # The block ends with a complete line; its newline separates it from the next block
+                    block = block[:-1]
+                
+                ctx = FileCtx(file_path, block, newline_count)
+                literal_hits = self._scan_literal_patterns(ctx)
+                if literal_hits is None or self._needs_line_scan:
+                    lines = self._line_candidates(ctx, literal_hits)
+                else:
+                    lines = None
+                
+                for compiled in self._compiled_rules:
+                    if compiled.regexes is None or compiled.index in failed_rules:
+                        continue
+                    try:
+                        hits_per_pattern = self._rule_pattern_violations(
+                            lines, file_path, compiled, literal_hits
+                        )
+                    except Exception as e:
+                        logger.error(f"Rule application failed for {compiled.rule_id}: {e}")
+                        failed_rules.add(compiled.index)
+                        continue
+                    for violations, hits in zip(pattern_violations[compiled.index], hits_per_pattern):
+                        violations.extend(hits)
+                
+                file_size += len(block) + (0 if is_last else 1)
+                newline_count += block.count('\n') + (0 if is_last else 1)
+                if is_last:
+                    break
+                block = next_block
+        
+        rule_violations = [
+            [] if rule_index in failed_rules else [v for hits in per_pattern for v in hits]
+            for rule_index, per_pattern in enumerate(pattern_violations)
+        ]
+        return self._build_file_results(file_path, file_size, newline_count + 1, rule_violations)
+    
+    def _build_file_results(self, file_path: Path, file_size: int, line_count: int,
+                            rule_violations: List[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Assemble a file's scan results from the violations found for each compiled rule"""
+        file_results = {
+            "file_path": _path_text(file_path),
+            "file_size": file_size,
+            "line_count": line_count,
+            "violations": [],
+            "compliance_checks": []
+        }
+        
+        for compiled, violations in zip(self._compiled_rules, rule_violations):
+            file_results["violations"].extend(violations)
+            
+            # Record compliance check
+            file_results["compliance_checks"].append({
+                "rule_id": compiled.key,
+                "violations_found": len(violations),
+                "category": compiled.category
+            })
+        
+        return file_results
+    
+    def _scan_literal_patterns(self, ctx: FileCtx) -> Optional[Dict[Tuple[int, int], List[Dict[str, Any]]]]:
+        """
+        Find violations for every literal pattern slot in a single automaton pass
+        
+        Args:
+            ctx: File content (or a line-aligned block of it)
+            
+        Returns:
+            Violations per (rule index, pattern index) slot, in line/column order,
+            or None when the fused scan does not apply (no automaton, non-ASCII content)
+        """
+        # Lowercasing non-ASCII text can change offsets and case folding differs from IGNORECASE
+        content = ctx.text
+        if self._literal_automaton is None or not content.isascii():
+            return None
+        
+        hits = {}
+        matches = list(self._literal_automaton.iter(content.lower()))
+        if not matches:
+            return hits
+        
+        # Offsets, lines and columns of all matches are resolved together in array operations
+        match_count = len(matches)
+        ends = np.fromiter((end_index for end_index, _ in matches), dtype=np.intp, count=match_count)
+        lengths = np.fromiter((length for _, (length, _) in matches), dtype=np.intp, count=match_count)
+        starts = ends - lengths + 1
+        line_indices, line_starts = _line_positions(ctx.newlines(), starts)
+        comment_flags = _comment_flags(ctx.buffer(), starts, line_starts)
+        columns = starts - line_starts
+        
+        path_text = ctx.path_text
+        line_offset = ctx.line_offset
+        last_end = {}
+        line_cache = {}  # stripped line content, shared by the violations on a line
+        comment_columns = {}  # quote-aware comment column of lines with a marker before a match
+        for (_, (length, slots)), start, line_index, line_start, column, in_comment in zip(
+                matches, starts.tolist(), line_indices.tolist(), line_starts.tolist(), columns.tolist(),
+                comment_flags):
+            line = None
+            matched_text = None
+            
+            if in_comment:
+                # The vectorized flags ignore quotes; confirm with the line's quote-aware comment column
+                comment_column = comment_columns.get(line_index)
+                if comment_column is None:
+                    line_end = content.find('\n', line_start)
+                    comment_column = comment_columns[line_index] = _comment_column(
+                        content[line_start:line_end if line_end != -1 else len(content)]
+                    )
+                in_comment = column >= comment_column
+            
+            for slot in slots:
+                # finditer semantics: matches of one pattern do not overlap
+                if start < last_end.get(slot, 0):
+                    continue
+                last_end[slot] = start + length
+                
+                # Skip matches in comments (basic check)
+                if in_comment:
+                    continue
+                
+                if line is None:
+                    line = line_cache.get(line_index)
+                    if line is None:
+                        line_end = content.find('\n', line_start)
+                        line = content[line_start:line_end if line_end != -1 else len(content)].strip()
+                        line_cache[line_index] = line
+                    matched_text = _share_text(content[start:start + length])
+                
+                compiled, suggestion = self._literal_slots[slot]
+                hits.setdefault(slot, []).append({
+                    "rule_id": compiled.rule_id,
+                    "file_path": path_text,
+                    "line_number": line_offset + line_index + 1,
+                    "column_start": column,
+                    "column_end": column + length,
+                    "matched_text": matched_text,
+                    "line_content": line,
+                    "category": compiled.category,
+                    "severity": compiled.severity,
+                    "description": compiled.description,
+                    "suggestion": suggestion
+                })
+        
+        return hits
+    
+    def _apply_rule_to_file(self, ctx: FileCtx, lines: Optional[List[Tuple[int, str, int]]], compiled: CompiledRule,
+                            literal_hits: Optional[Dict[Tuple[int, int], List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
         """
         Apply a specific compliance rule to file content
         
         Args:
-            content: File content
-            file_path: Path to file
-            rule: Compliance rule to apply
+            ctx: File content
+            lines: Candidate lines from _line_candidates (None if every
+                pattern is covered by literal_hits)
+            compiled: Compiled compliance rule to apply
+            literal_hits: Result of _scan_literal_patterns for this file
             
         Returns:
             List of violations found
         """
         violations = []
         
+        if compiled.regexes is None:
+            return violations
+        
         try:
-            scan_patterns = rule.get("scan_patterns", [])
-            rule_id = rule.get("rule_id", "unknown")
-            category = rule.get("category", "unknown")
-            severity = rule.get("severity", "MEDIUM")
-            description = rule.get("description", "Compliance rule violation")
-            
             # Pattern-based scanning
-            for pattern in scan_patterns:
-                violations.extend(self._find_pattern_violations(
-                    content, file_path, pattern, rule_id, category, severity, description
-                ))
+            for hits in self._rule_pattern_violations(lines, ctx.path, compiled, literal_hits):
+                violations.extend(hits)
             
             # Additional rule-specific checks
-            compliance_check = rule.get("compliance_check", {})
-            check_type = compliance_check.get("check_type", "pattern_match")
+            check_type = compiled.check_type
             
             if check_type == "pattern_match":
                 # Already handled above
                 pass
             elif check_type == "function_analysis":
-                violations.extend(self._analyze_functions(content, file_path, rule))
+                violations.extend(self._analyze_functions(ctx, compiled.rule))
             elif check_type == "import_analysis":
-                violations.extend(self._analyze_imports(content, file_path, rule))
+                violations.extend(self._analyze_imports(ctx, compiled.rule))
             
             return violations
             
         except Exception as e:
-            logger.error(f"Rule application failed for {rule.get('rule_id', 'unknown')}: {e}")
+            logger.error(f"Rule application failed for {compiled.rule_id}: {e}")
             return []
     
-    def _find_pattern_violations(self, content: str, file_path: Path, pattern: str, 
-                               rule_id: str, category: str, severity: str, description: str) -> List[Dict[str, Any]]:
-        """Find pattern-based violations in file content"""
+    def _rule_pattern_violations(self, lines: Optional[List[Tuple[int, str, int]]], file_path: Path, compiled: CompiledRule,
+                                 literal_hits: Optional[Dict[Tuple[int, int], List[Dict[str, Any]]]]) -> List[List[Dict[str, Any]]]:
+        """Violations of each of a rule's scan patterns, one list per pattern"""
+        per_pattern = []
+        for pattern_index in range(len(compiled.scan_patterns)):
+            slot = (compiled.index, pattern_index)
+            if literal_hits is not None and slot in self._literal_slots:
+                per_pattern.append(literal_hits.get(slot, []))
+            else:
+                per_pattern.append(self._find_pattern_violations(lines, file_path, compiled, pattern_index))
+        return per_pattern
+    
+    def _find_pattern_violations(self, lines: List[Tuple[int, str, int]], file_path: Path, compiled: CompiledRule,
+                                 pattern_index: int) -> List[Dict[str, Any]]:
+        """Find violations of one compiled (case-insensitive) scan pattern over candidate lines"""
         violations = []
-        lines = content.split('\n')
-        
-        # Create regex pattern (case-insensitive)
-        try:
-            regex_pattern = re.compile(pattern, re.IGNORECASE)
-        except re.error:
-            # If pattern is not valid regex, treat as literal string
-            regex_pattern = re.compile(re.escape(pattern), re.IGNORECASE)
+        regex_pattern = compiled.regexes[pattern_index]
+        suggestion = compiled.suggestions[pattern_index]
+        path_text = _path_text(file_path)
         
-        for line_num, line in enumerate(lines, 1):
+        for line_num, line, comment_column in lines:
+            line_content = None
             matches = regex_pattern.finditer(line)
             for match in matches:
                 # Skip matches in comments (basic check)
-                if self._is_in_comment(line, match.start()):
+                if match.start() >= comment_column:
                     continue
                 
+                if line_content is None:
+                    line_content = line.strip()
                 violation = {
-                    "rule_id": rule_id,
-                    "file_path": str(file_path),
+                    "rule_id": compiled.rule_id,
+                    "file_path": path_text,
                     "line_number": line_num,
                     "column_start": match.start(),
                     "column_end": match.end(),
-                    "matched_text": match.group(),
-                    "line_content": line.strip(),
-                    "category": category,
-                    "severity": severity,
-                    "description": description,
-                    "suggestion": self._generate_suggestion(pattern, category)
+                    "matched_text": _share_text(match.group()),
+                    "line_content": line_content,
+                    "category": compiled.category,
+                    "severity": compiled.severity,
+                    "description": compiled.description,
+                    "suggestion": suggestion
                 }
                 violations.append(violation)
         
         return violations
     
-    def _is_in_comment(self, line: str, position: int) -> bool:
-        """Check if position is within a comment"""
-        # Basic comment detection for common languages
-        comment_markers = ['#', '//', '/*', '*', '<!--']
-        
-        line_before_pos = line[:position]
-        for marker in comment_markers:
-            if marker in line_before_pos:
-                marker_pos = line_before_pos.rfind(marker)
-                if marker_pos < position:
-                    return True
-        
-        return False
-    
     def _generate_suggestion(self, pattern: str, category: str) -> str:
-        """Generate suggestion for fixing violation"""
-        suggestions = {
-            "password": "Use environment variables or secure credential management",
-            "pwd": "Use environment variables or secure credential management", 
-            "passwd": "Use environment variables or secure credential management",
-            "personal_data": "Implement proper data protection measures (encryption, access controls)",
-            "pii": "Handle personally identifiable information according to privacy regulations",
-            "sensitive": "Apply appropriate security controls for sensitive data",
-            "log": "Ensure audit logging includes necessary compliance information",
-            "audit": "Implement comprehensive audit trails for compliance",
-            "auth": "Use secure authentication mechanisms",
-            "token": "Implement secure token management practices"
-        }
-        
-        return suggestions.get(pattern.lower(), f"Review {category} compliance requirements")
+        """Generate suggestion for fixing violation (resolved once per rule pattern, see _compile_rules)"""
+        return PATTERN_SUGGESTIONS.get(pattern.lower(), f"Review {category} compliance requirements")
     
-    def _analyze_functions(self, content: str, file_path: Path, rule: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_functions(self, ctx: FileCtx, rule: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Analyze function definitions for compliance"""
         violations = []
+        path_text = ctx.path_text
         
-        # Basic function detection patterns for common languages
-        function_patterns = [
-            r'def\s+(\w+)\s*\(',  # Python
-            r'function\s+(\w+)\s*\(',  # JavaScript
-            r'(\w+)\s*\([^)]*\)\s*{',  # C/C++/Java/C#
-        ]
-        
-        for pattern in function_patterns:
-            matches = re.finditer(pattern, content, re.MULTILINE)
-            for match in matches:
+        for pattern in _FUNCTION_PATTERNS:
+            for match in pattern.finditer(ctx.text):
                 # Check if function needs compliance review
                 func_name = match.group(1) if match.groups() else "unknown"
-                if any(keyword in func_name.lower() for keyword in ["auth", "login", "password", "data", "user"]):
+                if contains_keyword(_SENSITIVE_FUNCTION_AUTOMATON, SENSITIVE_FUNCTION_KEYWORDS, func_name.lower()):
                     violations.append({
                         "rule_id": rule["rule_id"],
-                        "file_path": str(file_path),
+                        "file_path": path_text,
                         "function_name": func_name,
                         "category": rule["category"],
                         "severity": "MEDIUM",
@@ -338,32 +1575,19 @@ class RepositoryScanner:
         
         return violations
     
-    def _analyze_imports(self, content: str, file_path: Path, rule: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_imports(self, ctx: FileCtx, rule: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Analyze import statements for compliance"""
         violations = []
+        path_text = ctx.path_text
         
         # Look for potentially problematic imports
-        risky_imports = [
-            "subprocess", "os.system", "eval", "exec",  # Python security risks
-            "crypto", "hashlib", "ssl",  # Crypto libraries (may need review)
-            "requests", "urllib",  # Network libraries
-            "sqlite3", "mysql", "postgresql"  # Database libraries
-        ]
-        
-        import_patterns = [
-            r'import\s+(\w+)',
-            r'from\s+(\w+)\s+import',
-            r'require\([\'"](\w+)[\'"]\)',  # Node.js
-        ]
-        
-        for pattern in import_patterns:
-            matches = re.finditer(pattern, content)
-            for match in matches:
+        for pattern in _IMPORT_PATTERNS:
+            for match in pattern.finditer(ctx.text):
                 imported_module = match.group(1)
-                if any(risky in imported_module.lower() for risky in risky_imports):
+                if contains_keyword(_RISKY_IMPORT_AUTOMATON, RISKY_IMPORTS, imported_module.lower()):
                     violations.append({
                         "rule_id": rule["rule_id"],
-                        "file_path": str(file_path),
+                        "file_path": path_text,
                         "imported_module": imported_module,
                         "category": "security",
                         "severity": "LOW",
@@ -373,105 +1597,87 @@ class RepositoryScanner:
         
         return violations
     
-    def _calculate_scan_summary(self, results: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate summary statistics for scan results"""
-        violations = results.get("violations", [])
-        
-        # Count by severity
-        severity_counts = {"HIGH": 0, "MEDIUM": 0, "LOW": 0}
-        for violation in violations:
-            severity = violation.get("severity", "LOW")
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
-        
-        # Count by category
-        category_counts = {}
-        for violation in violations:
-            category = violation.get("category", "unknown")
-            category_counts[category] = category_counts.get(category, 0) + 1
+    def _violation_buffer(self, results: Dict[str, Any], violations: Optional[ViolationBuffer]) -> ViolationBuffer:
+        """The given columnar violations, or ones built from the result's violation dicts"""
+        if violations is None:
+            violations = ViolationBuffer()
+            violations.extend(results.get("violations", []))
+        return violations
+    
+    def _calculate_scan_summary(self, results: Dict[str, Any],
+                                violations: Optional[ViolationBuffer] = None) -> Dict[str, Any]:
+        """
+        Calculate summary statistics for scan results
         
-        # Files with violations
-        files_with_violations = len(set(v.get("file_path") for v in violations))
+        Args:
+            results: Scan results
+            violations: The results' violations, if already recorded in columns
+        """
         total_files_scanned = len(results.get("scanned_files", []))
-        
-        return {
-            "total_violations": len(violations),
-            "severity_breakdown": severity_counts,
-            "category_breakdown": category_counts,
-            "files_with_violations": files_with_violations,
-            "total_files_scanned": total_files_scanned,
-            "violation_rate": files_with_violations / max(total_files_scanned, 1)
-        }
+        return self._violation_buffer(results, violations).summary(total_files_scanned)
     
-    def _calculate_compliance_score(self, results: Dict[str, Any]) -> float:
-        """Calculate overall compliance score (0-1)"""
-        violations = results.get("violations", [])
-        total_files = len(results.get("scanned_files", []))
-        
-        if total_files == 0:
-            return 0.0
-        
-        # Weight violations by severity
-        severity_weights = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
-        weighted_violations = sum(
-            severity_weights.get(v.get("severity", "LOW"), 1) 
-            for v in violations
-        )
-        
-        # Calculate score (higher violations = lower score)
-        max_possible_violations = total_files * 10  # Assume max 10 violations per file
-        compliance_score = max(0.0, 1.0 - (weighted_violations / max_possible_violations))
+    def _calculate_compliance_score(self, results: Dict[str, Any],
+                                    violations: Optional[ViolationBuffer] = None) -> float:
+        """
+        Calculate overall compliance score (0-1), weighting violations by severity
         
-        return round(compliance_score, 3)
+        Args:
+            results: Scan results
+            violations: The results' violations, if already recorded in columns
+        """
+        total_files = len(results.get("scanned_files", []))
+        return self._violation_buffer(results, violations).compliance_score(total_files)
     
     def get_scan_report(self, results: Dict[str, Any]) -> str:
         """Generate human-readable scan report"""
-        report = []
+        report = io.StringIO()
+        write = report.write
+        rule_line = "=" * 60 + "\n"
         
-        report.append("=" * 60)
-        report.append("COMPLIANCE SCAN REPORT")
-        report.append("=" * 60)
+        write(rule_line)
+        write("COMPLIANCE SCAN REPORT\n")
+        write(rule_line)
         
         # Summary
         summary = results.get("scan_summary", {})
-        report.append(f"Repository: {results.get('repository_path', 'Unknown')}")
-        report.append(f"Scan Date: {results.get('scan_timestamp', 'Unknown')}")
-        report.append(f"Compliance Score: {results.get('compliance_score', 0.0):.1%}")
-        report.append(f"Total Violations: {summary.get('total_violations', 0)}")
-        report.append(f"Files Scanned: {summary.get('total_files_scanned', 0)}")
-        report.append("")
+        write(f"Repository: {results.get('repository_path', 'Unknown')}\n")
+        write(f"Scan Date: {results.get('scan_timestamp', 'Unknown')}\n")
+        write(f"Compliance Score: {results.get('compliance_score', 0.0):.1%}\n")
+        write(f"Total Violations: {summary.get('total_violations', 0)}\n")
+        write(f"Files Scanned: {summary.get('total_files_scanned', 0)}\n\n")
         
         # Severity breakdown
         severity_breakdown = summary.get("severity_breakdown", {})
-        report.append("VIOLATIONS BY SEVERITY:")
+        write("VIOLATIONS BY SEVERITY:\n")
         for severity in ["HIGH", "MEDIUM", "LOW"]:
-            count = severity_breakdown.get(severity, 0)
-            report.append(f"  {severity}: {count}")
-        report.append("")
+            write(f"  {severity}: {severity_breakdown.get(severity, 0)}\n")
+        write("\n")
         
         # Category breakdown
         category_breakdown = summary.get("category_breakdown", {})
         if category_breakdown:
-            report.append("VIOLATIONS BY CATEGORY:")
+            write("VIOLATIONS BY CATEGORY:\n")
             for category, count in category_breakdown.items():
-                report.append(f"  {category}: {count}")
-            report.append("")
+                write(f"  {category}: {count}\n")
+            write("\n")
         
-        # Top violations
+        # Top violations; the scan stops at the tenth HIGH one instead of filtering all violations
         violations = results.get("violations", [])
-        high_violations = [v for v in violations if v.get("severity") == "HIGH"]
+        high_violations = list(itertools.islice(
+            (violation for violation in violations if violation.get("severity") == "HIGH"), 10
+        ))
         
         if high_violations:
-            report.append("HIGH SEVERITY VIOLATIONS:")
-            for violation in high_violations[:10]:  # Top 10
-                report.append(f"  File: {violation.get('file_path', 'Unknown')}")
-                report.append(f"  Line: {violation.get('line_number', 'Unknown')}")
-                report.append(f"  Issue: {violation.get('description', 'Unknown')}")
-                report.append(f"  Suggestion: {violation.get('suggestion', 'Review required')}")
-                report.append("")
+            write("HIGH SEVERITY VIOLATIONS:\n")
+            for violation in high_violations:
+                write(f"  File: {violation.get('file_path', 'Unknown')}\n")
+                write(f"  Line: {violation.get('line_number', 'Unknown')}\n")
+                write(f"  Issue: {violation.get('description', 'Unknown')}\n")
+                write(f"  Suggestion: {violation.get('suggestion', 'Review required')}\n\n")
         
-        report.append("=" * 60)
+        write("=" * 60)
         
-        return "\n".join(report)
+        return report.getvalue()
     
     async def scan_repository_async(self, repo_path: str, file_extensions: List[str] = None) -> Dict[str, Any]:
         """Async version of repository scanning"""
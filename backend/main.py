@@ -1,19 +1,33 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, HttpUrl
 from typing import Optional, List, Dict, Any
 import uvicorn
+import asyncio
+import functools
 import logging
+import os
 import traceback
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from utils.git_utils import git_clone, analyze_repository_files
+from utils.git_utils import git_clone, analyze_repository_files, resolve_remote_head, shutdown_analysis_pool
+from utils.scan_cache import ScanCache
 
 # Add AI engine to path
 current_dir = Path(__file__).parent
 ai_engine_path = current_dir / "ai engine"
 sys.path.append(str(ai_engine_path))
 
+# Responses are encoded with orjson when it is installed; large compliance_issues lists encode several times faster
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+    DEFAULT_RESPONSE_CLASS = ORJSONResponse
+except ImportError:
+    DEFAULT_RESPONSE_CLASS = JSONResponse
+
 # Try to import AI components
 try:
     from compliance_analyzer import ComplianceAnalyzer
@@ -31,11 +45,58 @@ except ImportError as e:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Threads for network-bound clones, kept separate so slow remotes never hold up analysis
+CLONE_POOL = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("DEVSECOPS_CLONE_WORKERS", "8")),
+    thread_name_prefix="git-clone"
+)
+
+# Threads that drive analysis; the CPU-heavy file scanning fans out to the analysis process pool
+SCAN_POOL = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("DEVSECOPS_SCAN_WORKERS", "4")),
+    thread_name_prefix="repo-scan"
+)
+
+async def run_blocking(executor, fn, *args, **kwargs):
+    """Run a blocking call on executor without stalling the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+# Scan results of already analyzed commits, keyed by (URL, commit SHA, analysis depth)
+SCAN_CACHE = ScanCache()
+
+async def get_cached_scan(git_repo_url: str, analysis_depth: str) -> Optional[Dict[str, Any]]:
+    """
+    Cached result for the commit the remote's HEAD points to, resolved without cloning
+    
+    The remote is only asked for its HEAD when some scan of the repository is
+    cached, so first scans do not pay for the extra round trip.
+    """
+    if not SCAN_CACHE.has_repository(git_repo_url):
+        return None
+    commit_sha = await run_blocking(CLONE_POOL, resolve_remote_head, git_repo_url)
+    if commit_sha is None:
+        return None
+    cached = SCAN_CACHE.get(git_repo_url, commit_sha, analysis_depth)
+    if cached is not None:
+        logger.info(f"Serving cached {analysis_depth} scan of {git_repo_url}@{commit_sha}")
+    return cached
+
+def cache_scan_result(git_repo_url: str, analysis_depth: str, result: Dict[str, Any]):
+    """Store a complete scan under the commit that was cloned"""
+    issues = result.get("compliance_issues")
+    if issues is None or result.get("error_details") or any("error" in issue for issue in issues):
+        return
+    # The clone is temporary; a cached response must not point at a directory that no longer exists
+    cached = {key: value for key, value in result.items() if key != "clone_path"}
+    SCAN_CACHE.put(git_repo_url, result["repo_info"]["latest_commit"]["hash"], analysis_depth, cached)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Compliance Auditor API",
     description="A backend service for auditing Git repositories for compliance issues",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=DEFAULT_RESPONSE_CLASS
 )
 
 # Add CORS middleware for frontend integration
@@ -240,7 +301,7 @@ def ai_scan_repository(request: GitRepoRequest):
 
 # Simple git scan endpoint (GET with query parameter)
 @app.get("/git-scan", response_model=ScanResponse)
-def scan_git_repo(git_repo_url: str):
+async def scan_git_repo(git_repo_url: str):
     """
     Scan a Git repository for compliance issues.
     
@@ -261,9 +322,14 @@ def scan_git_repo(git_repo_url: str):
                 detail="Invalid git URL format. Must start with http://, https://, or git@"
             )
         
+        # Unchanged repositories are answered from the cache without cloning
+        cached = await get_cached_scan(git_repo_url, "basic")
+        if cached is not None:
+            return ScanResponse(**cached)
+        
         logger.info("Starting repository clone...")
         # Clone and get basic info
-        result = git_clone(git_repo_url)
+        result = await run_blocking(CLONE_POOL, git_clone, git_repo_url)
         logger.info(f"Clone result status: {result.get('status', 'unknown')}")
         
         if result["status"] == "error":
@@ -275,10 +341,13 @@ def scan_git_repo(git_repo_url: str):
             logger.info("Starting compliance analysis...")
             try:
                 # Use basic analysis for simple scan endpoint
-                compliance_issues = analyze_repository_files(result["clone_path"], analysis_depth="basic")
+                compliance_issues = await run_blocking(
+                    SCAN_POOL, analyze_repository_files, result["clone_path"], analysis_depth="basic"
+                )
                 result["compliance_issues"] = compliance_issues
                 result["issues_count"] = len([issue for issue in compliance_issues if "error" not in issue])
                 logger.info(f"Found {result['issues_count']} compliance issues")
+                cache_scan_result(git_repo_url, "basic", result)
             except Exception as analysis_error:
                 logger.error(f"Analysis failed: {analysis_error}")
                 result["compliance_issues"] = []
@@ -307,7 +376,7 @@ def scan_git_repo(git_repo_url: str):
 
 # Detailed git scan endpoint (POST with request body)
 @app.post("/git-scan-detailed", response_model=ScanResponse)
-def scan_git_repo_detailed(request: GitRepoRequest):
+async def scan_git_repo_detailed(request: GitRepoRequest):
     """
     Perform a detailed scan of a Git repository with additional options.
     
@@ -321,20 +390,29 @@ def scan_git_repo_detailed(request: GitRepoRequest):
         import time
         start_time = time.time()
         
+        # Unchanged repositories are answered from the cache without cloning
+        cached = await get_cached_scan(request.git_repo_url, request.analysis_depth)
+        if cached is not None:
+            cached["scan_duration"] = round(time.time() - start_time, 2)
+            return ScanResponse(**cached)
+        
         # Clone and get basic info
-        result = git_clone(request.git_repo_url)
+        result = await run_blocking(CLONE_POOL, git_clone, request.git_repo_url)
         
         if result["status"] == "error":
             raise HTTPException(status_code=400, detail=result["message"])
         
         # Analyze for compliance issues based on analysis depth
         if result["status"] == "success" and "clone_path" in result:
-            compliance_issues = analyze_repository_files(
+            compliance_issues = await run_blocking(
+                SCAN_POOL,
+                analyze_repository_files,
                 result["clone_path"], 
                 analysis_depth=request.analysis_depth
             )
             result["compliance_issues"] = compliance_issues
             result["issues_count"] = len([issue for issue in compliance_issues if "error" not in issue])
+            cache_scan_result(request.git_repo_url, request.analysis_depth, result)
         
         # Add scan duration
         end_time = time.time()
@@ -347,6 +425,14 @@ def scan_git_repo_detailed(request: GitRepoRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+# Release clone, scan and analysis workers when the server stops
+@app.on_event("shutdown")
+def shutdown_workers():
+    CLONE_POOL.shutdown(wait=False, cancel_futures=True)
+    SCAN_POOL.shutdown(wait=False, cancel_futures=True)
+    shutdown_analysis_pool()
+    SCAN_CACHE.close()
+
 # Get scan history (placeholder for future implementation)
 @app.get("/scan-history")
 def get_scan_history(limit: int = 10):
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the AI engine BatchScheduler
+Every submitted item must resolve, with a result or an exception
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+
+# Add ai engine to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "ai engine"))
+
+from batch_scheduler import BatchScheduler
+import compliance_analyzer
+
+
+async def submit_all(scheduler, items):
+    return await asyncio.wait_for(
+        asyncio.gather(*(scheduler.submit(item) for item in items), return_exceptions=True),
+        timeout=5
+    )
+
+
+def test_results_are_returned_in_order():
+    scheduler = BatchScheduler(lambda items: [item * 2 for item in items], max_wait_ms=5)
+    assert asyncio.run(submit_all(scheduler, [1, 2, 3])) == [2, 4, 6]
+
+
+def test_short_result_list_fails_every_item():
+    scheduler = BatchScheduler(lambda items: items[:1], max_wait_ms=5)
+    results = asyncio.run(submit_all(scheduler, [1, 2, 3]))
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_batch_exception_fails_every_item():
+    def fail(items):
+        raise ValueError("model unavailable")
+
+    scheduler = BatchScheduler(fail, max_wait_ms=5)
+    results = asyncio.run(submit_all(scheduler, [1, 2]))
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+class FakeLegalBERT:
+    """Stand-in for LegalBERTPipeline, so no model is loaded"""
+
+    def __init__(self, **kwargs):
+        pass
+
+    def analyze_batch(self, texts):
+        return [{"classification": {"label": "COMPLIANCE"}} for _ in texts]
+
+
+def test_shared_bert_scheduler_owns_its_executor(monkeypatch):
+    monkeypatch.setattr(compliance_analyzer, "_PIPELINE_REGISTRY", {})
+    monkeypatch.setattr(compliance_analyzer, "LegalBERTPipeline", FakeLegalBERT)
+    analyzers = [
+        compliance_analyzer.ComplianceAnalyzer(
+            use_spacy=False, use_int8=False, use_onnx=False, policies_dir=tempfile.mkdtemp()
+        )
+        for _ in range(2)
+    ]
+
+    scheduler = analyzers[0]._bert_scheduler
+    assert scheduler is analyzers[1]._bert_scheduler
+    assert scheduler.executor is not None
+    assert all(scheduler.executor is not analyzer._exec for analyzer in analyzers)
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tests for the entropy helpers used to rank hardcoded secret findings
+"""
+
+import sys
+import math
+
+from utils.entropy import shannon_entropy, assigned_value_entropy
+
+
+def test_single_symbol_has_zero_entropy():
+    value = shannon_entropy(b"aaaa")
+    assert value == 0.0
+    assert math.copysign(1.0, value) == 1.0
+
+
+def test_uniform_bytes():
+    assert shannon_entropy("abcd") == 2.0
+    assert shannon_entropy(b"") == 0.0
+
+
+def test_assigned_value_is_measured():
+    assert assigned_value_entropy('api_key = "abcd";') == 2.0
+    assert assigned_value_entropy(b"api_key=abcd") == 2.0
+
+
+def test_comparisons_are_not_assignments():
+    for line in ("x == y", "x != y", "x <= y", "x >= y"):
+        assert assigned_value_entropy(line) == 0.0
+        assert assigned_value_entropy(line.encode()) == 0.0
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
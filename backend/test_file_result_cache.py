@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the RepositoryScanner per-file result cache
+Cached results are keyed by file content, so edits always invalidate them and identical files in a new clone reuse them
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+
+# Add ai engine to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "ai engine"))
+
+import repository_scanner
+from repository_scanner import RepositoryScanner
+
+RULES = {
+    "security_001": {
+        "rule_id": "security_001",
+        "description": "Passwords should not be hardcoded",
+        "category": "security",
+        "severity": "HIGH",
+        "scan_patterns": ["password"],
+        "compliance_check": {"check_type": "pattern_match"}
+    }
+}
+
+
+def make_repo(files):
+    """Temporary directory holding files (name -> content)"""
+    repo = tempfile.mkdtemp()
+    for name, content in files.items():
+        with open(os.path.join(repo, name), "w") as f:
+            f.write(content)
+    return repo
+
+
+def scan(scanner, repo):
+    return scanner.scan_repository(repo)
+
+
+def test_rewrite_with_same_size_and_mtime_is_rescanned(monkeypatch):
+    monkeypatch.setattr(repository_scanner, "FILE_RESULT_CACHE_SIZE", 100)
+    repo = make_repo({"app.py": "password = 'x'\n"})
+    path = os.path.join(repo, "app.py")
+    scanner = RepositoryScanner(compliance_rules=RULES, max_workers=1)
+
+    assert len(scan(scanner, repo)["violations"]) == 1
+
+    # Same size, original mtime restored
+    stat = os.stat(path)
+    with open(path, "w") as f:
+        f.write("username = 'x'\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    cached_scan = scan(scanner, repo)
+    fresh_scan = scan(RepositoryScanner(compliance_rules=RULES, max_workers=1), repo)
+    assert len(cached_scan["violations"]) == len(fresh_scan["violations"]) == 0
+
+
+def test_identical_content_in_new_clone_hits_cache(monkeypatch):
+    monkeypatch.setattr(repository_scanner, "FILE_RESULT_CACHE_SIZE", 100)
+    first = make_repo({"app.py": "password = 'x'\n"})
+    second = tempfile.mkdtemp()
+    shutil.copy(os.path.join(first, "app.py"), os.path.join(second, "app.py"))
+    scanner = RepositoryScanner(compliance_rules=RULES, max_workers=1)
+
+    scan(scanner, first)
+    scanned = []
+    original = scanner._scan_changed_files
+    monkeypatch.setattr(scanner, "_scan_changed_files", lambda files: scanned.extend(files) or original(files))
+
+    results = scan(scanner, second)
+    assert scanned == []
+    assert [v["file_path"] for v in results["violations"]] == [os.path.join(second, "app.py")]
+
+
+def test_cache_is_bounded_by_stored_violations(monkeypatch):
+    monkeypatch.setattr(repository_scanner, "FILE_RESULT_CACHE_SIZE", 100)
+    monkeypatch.setattr(repository_scanner, "FILE_RESULT_CACHE_VIOLATIONS", 3)
+    repo = make_repo({f"f{i}.py": "password = 1\n" * (i + 1) for i in range(3)})
+    scanner = RepositoryScanner(compliance_rules=RULES, max_workers=1)
+
+    scan(scanner, repo)
+    assert scanner._file_results_violations <= 3
+
+
+def test_rule_change_clears_cache(monkeypatch):
+    monkeypatch.setattr(repository_scanner, "FILE_RESULT_CACHE_SIZE", 100)
+    repo = make_repo({"app.py": "password = 'x'\ntoken = 'y'\n"})
+    scanner = RepositoryScanner(compliance_rules=RULES, max_workers=1)
+    assert [v["matched_text"] for v in scan(scanner, repo)["violations"]] == ["password"]
+
+    rule = dict(RULES["security_001"], scan_patterns=["token"])
+    scanner.compliance_rules = {"security_001": rule}
+    scanner._compile_rules()
+    assert scanner._file_results == {}
+    assert [v["matched_text"] for v in scan(scanner, repo)["violations"]] == ["token"]
+
+
+def test_cache_is_disabled_by_default():
+    repo = make_repo({"app.py": "password = 'x'\n"})
+    scanner = RepositoryScanner(compliance_rules=RULES, max_workers=1)
+    scan(scanner, repo)
+    assert scanner._file_results == {}
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared keyword matching helpers
+The Aho-Corasick path and the substring fallback must report the same keywords
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add ai engine to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "ai engine"))
+
+from keyword_matching import build_keyword_automaton, find_keywords, contains_keyword
+
+KEYWORDS = frozenset({"data", "personal data", "gdpr", "law", "governing law"})
+TEXTS = ["", "personal data under the governing law", "gdpr-compliant", "nothing relevant", "datalaw"]
+
+
+def test_fallback_finds_every_keyword():
+    assert find_keywords(None, KEYWORDS, "personal data under the governing law") == {
+        "data", "personal data", "law", "governing law"
+    }
+    assert contains_keyword(None, KEYWORDS, "gdpr-compliant")
+    assert not contains_keyword(None, KEYWORDS, "nothing relevant")
+
+
+def test_automaton_matches_fallback():
+    automaton = build_keyword_automaton(KEYWORDS)
+    if automaton is None:
+        pytest.skip("pyahocorasick is not installed")
+    for text in TEXTS:
+        assert find_keywords(automaton, KEYWORDS, text) == find_keywords(None, KEYWORDS, text)
+        assert contains_keyword(automaton, KEYWORDS, text) == contains_keyword(None, KEYWORDS, text)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
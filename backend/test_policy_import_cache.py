@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the policy analysis cache during folder imports
+Each imported policy is hashed and looked up once, and cached policies are not summarized again
+"""
+
+import sys
+import os
+import tempfile
+
+# Add ai engine to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "ai engine"))
+
+from policy_processor import PolicyProcessor
+
+
+class FakeSummarizer:
+    """Stand-in for the summarization pipeline, recording the texts it is given"""
+
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, texts, **kwargs):
+        self.texts.extend(texts)
+        return [{"summary_text": "summary"} for _ in texts]
+
+
+def make_policy_folder(count):
+    folder = tempfile.mkdtemp()
+    for i in range(count):
+        with open(os.path.join(folder, f"policy_{i}.txt"), "w") as f:
+            f.write(f"Policy {i}: personal data must be encrypted at rest. " * 20)
+    return folder
+
+
+def count_calls(monkeypatch, processor, name, calls):
+    original = getattr(processor, name)
+
+    def wrapper(*args):
+        calls[name] = calls.get(name, 0) + 1
+        return original(*args)
+
+    monkeypatch.setattr(processor, name, wrapper)
+
+
+def test_each_policy_is_looked_up_once(monkeypatch):
+    processor = PolicyProcessor(policies_dir=tempfile.mkdtemp())
+    processor.summarizer = FakeSummarizer()
+    calls = {}
+    count_calls(monkeypatch, processor, "_analysis_cache_key", calls)
+    count_calls(monkeypatch, processor, "_get_cached_analysis", calls)
+
+    results = processor.import_policy_folder(make_policy_folder(3))
+    assert results["processed_count"] == 3
+    assert calls == {"_analysis_cache_key": 3, "_get_cached_analysis": 3}
+    assert len(processor.summarizer.texts) == 3
+
+
+def test_cached_policies_are_not_summarized_again():
+    folder = make_policy_folder(2)
+    processor = PolicyProcessor(policies_dir=tempfile.mkdtemp())
+    processor.summarizer = FakeSummarizer()
+
+    processor.import_policy_folder(folder)
+    processor.summarizer.texts.clear()
+    results = processor.import_policy_folder(folder)
+
+    assert results["processed_count"] == 2
+    assert processor.summarizer.texts == []
+    assert all(policy["summary"] == "summary" for policy in results["policies"])
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
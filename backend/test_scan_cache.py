@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the commit-keyed ScanCache
+Results are only reused for the same repository, commit and depth, and nothing touches disk until the cache is used
+"""
+
+import sys
+import os
+import tempfile
+
+from utils import scan_cache
+from utils.scan_cache import ScanCache
+
+URL = "https://github.com/example/repo"
+RESULT = {"status": "success", "compliance_issues": [{"type": "todo", "line": 3}]}
+
+
+def test_database_is_created_on_first_use():
+    path = os.path.join(tempfile.mkdtemp(), "nested", "scan_cache.sqlite")
+    cache = ScanCache(path=path)
+    assert not os.path.exists(os.path.dirname(path))
+
+    cache.put(URL, "abc123", "basic", RESULT)
+    assert os.path.exists(path)
+    cache.close()
+
+
+def test_results_survive_restart():
+    path = os.path.join(tempfile.mkdtemp(), "scan_cache.sqlite")
+    cache = ScanCache(path=path)
+    cache.put(URL, "abc123", "basic", RESULT)
+    cache.close()
+
+    reopened = ScanCache(path=path)
+    assert reopened.has_repository(URL)
+    assert reopened.get(URL, "abc123", "basic") == RESULT
+    reopened.close()
+
+
+def test_key_includes_commit_and_depth():
+    cache = ScanCache(path=None)
+    cache.put(URL, "abc123", "basic", RESULT)
+
+    assert cache.get(URL, "abc123", "basic") == RESULT
+    assert cache.get(URL, "def456", "basic") is None
+    assert cache.get(URL, "abc123", "detailed") is None
+    assert cache.get(URL + "-fork", "abc123", "basic") is None
+
+
+def test_has_repository_only_matches_exact_url():
+    path = os.path.join(tempfile.mkdtemp(), "scan_cache.sqlite")
+    cache = ScanCache(path=path, memory_size=0)
+    assert not cache.has_repository(URL)
+
+    cache.put(URL + "-fork", "abc123", "basic", RESULT)
+    assert not cache.has_repository(URL)
+    cache.put(URL, "abc123", "basic", RESULT)
+    assert cache.has_repository(URL)
+    cache.close()
+
+
+def test_version_bump_invalidates_stored_results(monkeypatch):
+    path = os.path.join(tempfile.mkdtemp(), "scan_cache.sqlite")
+    cache = ScanCache(path=path)
+    cache.put(URL, "abc123", "basic", RESULT)
+    cache.close()
+
+    monkeypatch.setattr(scan_cache, "SCAN_CACHE_VERSION", scan_cache.SCAN_CACHE_VERSION + 1)
+    reopened = ScanCache(path=path)
+    assert not reopened.has_repository(URL)
+    assert reopened.get(URL, "abc123", "basic") is None
+    reopened.close()
+
+
+def test_hits_are_independent_copies():
+    cache = ScanCache(path=None)
+    cache.put(URL, "abc123", "basic", RESULT)
+
+    cache.get(URL, "abc123", "basic")["compliance_issues"].clear()
+    assert cache.get(URL, "abc123", "basic") == RESULT
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
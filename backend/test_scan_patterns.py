@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Equivalence and complexity tests for the rewritten scan regexes
+The function and URL patterns find exactly what the originals found; the email pattern
+also does within RFC 5321 lengths, and deliberately drops longer local parts, domains and TLDs
+"""
+
+import sys
+import os
+import ast
+import re
+import time
+import random
+import tempfile
+
+import pytest
+
+# Add ai engine to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "ai engine"))
+
+import repository_scanner
+from repository_scanner import RepositoryScanner, _FUNCTION_PATTERNS
+
+# The patterns as they were before the rewrite
+OLD_FUNCTION_PATTERN = re.compile(r'(\w+)\s*\([^)]*\)\s*{', re.MULTILINE)
+OLD_EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+OLD_URL_PATTERN = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+
+
+def load_compliance_patterns():
+    """COMPLIANCE_PATTERNS of entity_extractor, read from its source so spaCy is not needed"""
+    path = os.path.join(os.path.dirname(__file__), "ai engine", "entity_extractor.py")
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "COMPLIANCE_PATTERNS":
+            # {entity_type: re.compile(pattern) for entity_type, pattern in {...}.items()}
+            patterns = ast.literal_eval(node.value.generators[0].iter.func.value)
+            return {entity_type: re.compile(pattern) for entity_type, pattern in patterns.items()}
+    raise AssertionError("COMPLIANCE_PATTERNS not found")
+
+
+def random_corpus(alphabet, words, count=2000, seed=0):
+    """Random lines built from single characters and longer fragments"""
+    rng = random.Random(seed)
+    pieces = list(alphabet) + list(words)
+    return ["".join(rng.choice(pieces) for _ in range(rng.randint(0, 60))) for _ in range(count)]
+
+
+def matches(pattern, text):
+    return [(match.span(), match.groups()) for match in pattern.finditer(text)]
+
+
+def test_function_pattern_matches_original():
+    new_pattern = _FUNCTION_PATTERNS[2]
+    corpus = random_corpus("ab_1 \t\n(){};,", ["login", "def ", "function ", "if (x) {", "auth_user"])
+    corpus += [
+        "int login(char *user) {\n  return 0;\n}",
+        "public void saveUserData(String data)\n{\n}",
+        "if (ready) { run(); }",
+        "const f = function getPassword(a, b) {",
+    ]
+    for text in corpus:
+        assert matches(new_pattern, text) == matches(OLD_FUNCTION_PATTERN, text), text
+
+
+def test_url_pattern_matches_original():
+    new_pattern = load_compliance_patterns()["url"]
+    corpus = random_corpus("aZ09$-_@.&+!*(),%\\ \"'<>#?/=~", ["http://", "https://", "%2F", "%zz"])
+    corpus += ["See https://example.com/a?b=c&d=%20e for details", "<a href=\"http://x.io/(1)\">"]
+    for text in corpus:
+        assert matches(new_pattern, text) == matches(OLD_URL_PATTERN, text), text
+
+
+def test_email_pattern_matches_original():
+    new_pattern = load_compliance_patterns()["email"]
+    corpus = random_corpus("aZ09._%+- @|", ["@", ".com", ".org", "user", "example", "dpo@acme.eu"])
+    corpus += ["Contact privacy.officer+gdpr@example.co.uk or dpo@acme.eu.", "not-an-address@localhost"]
+    for text in corpus:
+        assert matches(new_pattern, text) == matches(OLD_EMAIL_PATTERN, text), text
+
+
+def test_email_pattern_drops_over_length_parts():
+    new_pattern = load_compliance_patterns()["email"]
+    over_length = [
+        "a" * 65 + "@example.com",
+        "user@" + "d" * 256 + ".com",
+        "user@example." + "t" * 64,
+    ]
+    for text in over_length:
+        assert OLD_EMAIL_PATTERN.search(text), text
+        assert new_pattern.search(text) is None, text
+
+    # At the limits the address is still found
+    for text in ("a" * 64 + "@example.com", "user@" + "d" * 255 + ".com", "user@example." + "t" * 63):
+        assert matches(new_pattern, text) == matches(OLD_EMAIL_PATTERN, text), text
+
+
+def test_function_pattern_is_linear_on_long_identifiers():
+    line = "a" * 200000 + "("
+    start = time.perf_counter()
+    assert _FUNCTION_PATTERNS[2].search(line) is None
+    assert time.perf_counter() - start < 1.0
+
+
+NESTED_RULES = {
+    "custom_001": {
+        "rule_id": "custom_001",
+        "description": "Repeated token before a terminator",
+        "category": "security",
+        "severity": "LOW",
+        "scan_patterns": ["(a+)+b"],
+        "compliance_check": {"check_type": "pattern_match"}
+    }
+}
+
+
+def scan_lines(lines):
+    """Violations of NESTED_RULES in a file holding lines, without the (temporary) file path"""
+    repo = tempfile.mkdtemp()
+    with open(os.path.join(repo, "data.py"), "w") as f:
+        f.write("\n".join(lines) + "\n")
+    scanner = RepositoryScanner(compliance_rules=NESTED_RULES, max_workers=1)
+    violations = scanner.scan_repository(repo)["violations"]
+    return [{key: value for key, value in violation.items() if key != "file_path"} for violation in violations]
+
+
+def test_re2_matches_python_re_on_nested_quantifiers(monkeypatch):
+    pytest.importorskip("re2")
+    lines = random_corpus("abcAB ", ["aaab", "ba"], count=300, seed=1)
+
+    monkeypatch.setattr(repository_scanner, "_compiled_rule_sets", {})
+    re2_violations = scan_lines(lines)
+
+    monkeypatch.setattr(repository_scanner, "_compiled_rule_sets", {})
+    monkeypatch.setattr(repository_scanner, "RE2_AVAILABLE", False)
+    re_violations = scan_lines(lines)
+
+    assert re2_violations == re_violations
+    assert re2_violations
+
+
+def test_re2_is_linear_on_nested_quantifiers(monkeypatch):
+    pytest.importorskip("re2")
+    monkeypatch.setattr(repository_scanner, "_compiled_rule_sets", {})
+
+    # Python's re needs about 2^40 steps to reject this line
+    start = time.perf_counter()
+    assert scan_lines(["a" * 40 + "c"]) == []
+    assert time.perf_counter() - start < 5.0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -1,4 +1,6 @@
 # This makes utils a Python package
-from .git_utils import git_clone, analyze_repository_files
+from .git_utils import git_clone, analyze_repository_files, resolve_remote_head
+from .entropy import shannon_entropy
+from .scan_cache import ScanCache
 
-__all__ = ['git_clone', 'analyze_repository_files']
+__all__ = ['git_clone', 'analyze_repository_files', 'resolve_remote_head', 'shannon_entropy', 'ScanCache']
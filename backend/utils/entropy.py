@@ -0,0 +1,39 @@
+import re
+import numpy as np
+from typing import Union
+
+# Characters stripped around an assigned value before its entropy is measured
+VALUE_DELIMITERS = ' \t\r\'"`;,'
+
+# An assignment '=', i.e. not part of ==, !=, <= or >=
+ASSIGNMENT_PATTERN = re.compile(r'(?<![=!<>])=(?!=)')
+ASSIGNMENT_PATTERN_BYTES = re.compile(ASSIGNMENT_PATTERN.pattern.encode('ascii'))
+
+
+def shannon_entropy(data: Union[bytes, str]) -> float:
+    """
+    Shannon entropy of data in bits per byte (text is measured as UTF-8)
+
+    The byte histogram is tallied in one np.bincount pass instead of a Python
+    loop over the characters.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if not data:
+        return 0.0
+
+    counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+    probabilities = counts[counts > 0] / len(data)
+    # A single repeated byte sums to -0.0
+    return max(0.0, float(-(probabilities * np.log2(probabilities)).sum()))
+
+
+def assigned_value_entropy(line: Union[bytes, str]) -> float:
+    """Entropy of the value assigned on a source line (text after the first assignment '='), 0.0 if it has none"""
+    pattern = ASSIGNMENT_PATTERN_BYTES if isinstance(line, bytes) else ASSIGNMENT_PATTERN
+    match = pattern.search(line)
+    if match is None:
+        return 0.0
+    value = line[match.end():]
+    delimiters = VALUE_DELIMITERS.encode('ascii') if isinstance(value, bytes) else VALUE_DELIMITERS
+    return shannon_entropy(value.strip(delimiters))
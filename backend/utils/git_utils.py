@@ -1,13 +1,141 @@
 import git
+import io
 import os
 import tempfile
 import shutil
 import logging
+import re
+import functools
+import itertools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from git import Repo
 
+from .entropy import assigned_value_entropy
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
-def git_clone(git_repo_url: str):
+# Lowercase terms looked for by the basic, detailed and full analysis checks
+SECRET_TERMS = ('password', 'api_key', 'secret', 'token', 'private_key', 'access_token')
+TODO_TERMS = ('todo', 'fixme')
+SQL_TERMS = ('select * from', 'drop table', 'delete from')
+INSECURE_URL_TERM = 'http://'
+ANALYSIS_TERMS = SECRET_TERMS + TODO_TERMS + SQL_TERMS + (INSECURE_URL_TERM,)
+
+# File extensions analyzed at each analysis depth
+ANALYSIS_EXTENSIONS = {
+    "basic": ('.py', '.js', '.java', '.cpp'),
+    "detailed": ('.py', '.js', '.java', '.cpp', '.c', '.php', '.rb', '.go', '.rs'),
+    "full": ('.py', '.js', '.java', '.cpp', '.c', '.php', '.rb', '.go', '.rs', '.ts', '.jsx', '.tsx', '.vue', '.cs', '.swift', '.kt')
+}
+
+# Clones fetch one branch and no trees or blobs beyond those of the checked-out commit; the full
+# commit graph is still fetched so commit_count stays exact. A positive DEVSECOPS_CLONE_DEPTH also
+# truncates history (commit_count then counts only the fetched commits).
+CLONE_MULTI_OPTIONS = ['--single-branch', '--filter=tree:0']
+CLONE_DEPTH = int(os.getenv("DEVSECOPS_CLONE_DEPTH", "0"))
+
+# Seconds to wait for a remote to report its HEAD before scanning without the result cache
+REMOTE_HEAD_TIMEOUT = 10
+
+# Directories never descended into during analysis: VCS metadata, dependencies and build output
+SKIPPED_DIRECTORIES = frozenset(('.git', 'node_modules', 'dist', 'build', 'vendor'))
+
+# Files larger than this (generated bundles, data dumps) are skipped during analysis
+MAX_ANALYSIS_FILE_BYTES = int(os.getenv("DEVSECOPS_MAX_ANALYSIS_FILE_BYTES", str(2 * 1024 * 1024)))
+
+# (term, issue, description) of the detailed hardcoded-secret checks, formatted once
+_DETAILED_SECRET_CHECKS = tuple(
+    (term, f"Potential hardcoded {term.replace('_', ' ')}", f"Found potential hardcoded {term.replace('_', ' ')} in source code")
+    for term in ('secret', 'token', 'private_key', 'access_token')
+)
+
+# (term, description) of the full SQL injection checks
+_SQL_CHECKS = tuple((term, f"Found potential SQL injection pattern: {term}") for term in SQL_TERMS)
+
+# Files analyzed in worker processes once an analysis has at least PARALLEL_ANALYSIS_MIN_FILES of them,
+# ANALYSIS_CHUNK_SIZE files per task
+ANALYSIS_WORKERS = int(os.getenv("DEVSECOPS_ANALYSIS_WORKERS", str(os.cpu_count() or 1)))
+PARALLEL_ANALYSIS_MIN_FILES = 256
+ANALYSIS_CHUNK_SIZE = 32
+
+# Start method of analysis workers: forking the threaded API server could copy a held lock into a
+# worker and deadlock it. Workers import this module, which builds the term databases on import.
+ANALYSIS_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Worker processes kept across analyses, see _get_analysis_pool
+_analysis_pool = None
+_analysis_pool_lock = threading.Lock()
+
+# Terms each analysis depth reports on, for files with and without an '=' (secret terms need one)
+_DEPTH_TERMS = {
+    (depth, has_assignment): tuple(
+        term for term in ANALYSIS_TERMS
+        if (has_assignment or term not in SECRET_TERMS)
+        and (depth == "full" or term not in SQL_TERMS + (INSECURE_URL_TERM,))
+        and (depth != "basic" or term in ('password', 'api_key'))
+    )
+    for depth in ("basic", "detailed", "full")
+    for has_assignment in (False, True)
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _build_term_database(terms: Tuple[str, ...]):
+    """Compile terms into one Hyperscan database reporting the first match of each term"""
+    if not HYPERSCAN_AVAILABLE or not terms:
+        return None
+    
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[re.escape(term).encode('ascii') for term in terms],
+            ids=list(range(len(terms))),
+            elements=len(terms),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(terms)
+        )
+        return database
+    except Exception as e:
+        logger.warning(f"Could not compile analysis terms with Hyperscan, using str.find: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _build_term_automaton(terms: Tuple[str, ...]):
+    """Build an Aho-Corasick automaton over terms, or None when pyahocorasick is missing"""
+    if not AHOCORASICK_AVAILABLE or not terms:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
+
+# Built once per process, when the API imports this module at startup
+for _terms in set(_DEPTH_TERMS.values()):
+    _build_term_database(_terms)
+    _build_term_automaton(_terms)
+
+
+def git_clone(git_repo_url: str, branch: Optional[str] = None):
     logger.info(f"Starting to clone repository: {git_repo_url}")
     
     # Create a temporary directory for cloning
@@ -24,15 +152,19 @@ def git_clone(git_repo_url: str):
         
         logger.info(f"Cloning to: {clone_path}")
         
-        # Clone the repository using GitPython
-        repo = Repo.clone_from(git_repo_url, clone_path)
+        # Clone the repository using GitPython; without branch, git checks out the remote's default
+        clone_options = {"branch": branch} if branch else {}
+        if CLONE_DEPTH > 0:
+            clone_options["depth"] = CLONE_DEPTH
+        repo = Repo.clone_from(git_repo_url, clone_path, multi_options=CLONE_MULTI_OPTIONS, **clone_options)
         
         logger.info(f"Repository cloned successfully to: {clone_path}")
         
         # Get repository information
         repo_info = {
             "active_branch": repo.active_branch.name,
-            "commit_count": len(list(repo.iter_commits())),
+            # Counted by git from the commit graph alone, which a treeless clone has in full
+            "commit_count": int(repo.git.rev_list('--count', 'HEAD')),
             "latest_commit": {
                 "hash": repo.head.commit.hexsha,
                 "message": repo.head.commit.message.strip(),
@@ -87,68 +219,33 @@ def git_clone(git_repo_url: str):
         # shutil.rmtree(temp_dir, ignore_errors=True)
         pass
 
+def resolve_remote_head(git_repo_url: str) -> Optional[str]:
+    """Commit SHA the remote's HEAD points to, without cloning (None if it cannot be resolved)"""
+    # Same URL check as git_clone; it also keeps the URL from being read as a git option
+    if not git_repo_url.startswith(('http://', 'https://', 'git@')):
+        return None
+    
+    try:
+        output = git.cmd.Git().ls_remote(git_repo_url, 'HEAD', kill_after_timeout=REMOTE_HEAD_TIMEOUT)
+    except git.exc.GitError as e:
+        logger.warning(f"Could not resolve HEAD of {git_repo_url}: {e}")
+        return None
+    
+    sha = output.split('\t', 1)[0].strip()
+    return sha or None
+
 def analyze_repository_files(clone_path: str, analysis_depth: str = "basic"):
     """Analyze files in the cloned repository for compliance issues"""
     try:
         compliance_issues = []
         
-        # Define different analysis levels
-        file_extensions = {
-            "basic": ('.py', '.js', '.java', '.cpp'),
-            "detailed": ('.py', '.js', '.java', '.cpp', '.c', '.php', '.rb', '.go', '.rs'),
-            "full": ('.py', '.js', '.java', '.cpp', '.c', '.php', '.rb', '.go', '.rs', '.ts', '.jsx', '.tsx', '.vue', '.cs', '.swift', '.kt')
-        }
-        
         # Get file extensions based on analysis depth
-        target_extensions = file_extensions.get(analysis_depth, file_extensions["basic"])
+        target_extensions = ANALYSIS_EXTENSIONS.get(analysis_depth, ANALYSIS_EXTENSIONS["basic"])
         
-        for root, dirs, files in os.walk(clone_path):
-            # Skip .git directory
-            if '.git' in dirs:
-                dirs.remove('.git')
-                
-            for file in files:
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, clone_path)
-                
-                # Check files based on analysis depth
-                if file.endswith(target_extensions):
-                    # Check for potential security issues
-                    try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                            
-                            # Basic security checks
-                            if 'password' in content.lower() and '=' in content:
-                                line_num = _find_line_number(content, 'password')
-                                compliance_issues.append({
-                                    "file": rel_path,
-                                    "issue": "Potential hardcoded password",
-                                    "severity": "high",
-                                    "line": line_num,
-                                    "description": "Found potential hardcoded password in source code"
-                                })
-                                
-                            if 'api_key' in content.lower() and '=' in content:
-                                line_num = _find_line_number(content, 'api_key')
-                                compliance_issues.append({
-                                    "file": rel_path,
-                                    "issue": "Potential hardcoded API key",
-                                    "severity": "high",
-                                    "line": line_num,
-                                    "description": "Found potential hardcoded API key in source code"
-                                })
-                            
-                            # Additional checks for detailed and full analysis
-                            if analysis_depth in ["detailed", "full"]:
-                                _perform_detailed_analysis(content, rel_path, compliance_issues)
-                            
-                            if analysis_depth == "full":
-                                _perform_full_analysis(content, rel_path, compliance_issues)
-                                
-                    except Exception as file_error:
-                        logger.warning(f"Could not analyze file {rel_path}: {file_error}")
-                        continue
+        file_paths = list(_iter_analysis_files(clone_path, target_extensions))
+        
+        for file_issues in _analyze_files(file_paths, clone_path, analysis_depth):
+            compliance_issues.extend(file_issues)
         
         return compliance_issues
         
@@ -157,39 +254,232 @@ def analyze_repository_files(clone_path: str, analysis_depth: str = "basic"):
         return [{"error": f"Analysis failed: {str(e)}"}]
 
 
-def _find_line_number(content: str, search_term: str) -> int:
-    """Find the line number where a search term appears"""
+def _iter_analysis_files(clone_path: str, extensions: Tuple[str, ...]) -> Iterator[str]:
+    """
+    Paths of the files worth analyzing under clone_path, in os.walk order
+    
+    SKIPPED_DIRECTORIES are pruned without being listed, and only files with one
+    of the extensions are stat'ed; empty files and files over MAX_ANALYSIS_FILE_BYTES
+    are left out.
+    """
+    pending = [clone_path]
+    while pending:
+        directory = pending.pop()
+        subdirectories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            # Like os.walk, symlinked directories are not followed
+                            if entry.name not in SKIPPED_DIRECTORIES and not entry.is_symlink():
+                                subdirectories.append(entry.path)
+                        elif entry.name.endswith(extensions) and 0 < entry.stat().st_size <= MAX_ANALYSIS_FILE_BYTES:
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"Could not list directory {directory}: {e}")
+            continue
+        
+        pending.extend(reversed(subdirectories))
+
+
+def _analyze_files(file_paths: List[str], clone_path: str, analysis_depth: str) -> Iterator[List[dict]]:
+    """Issues of each file in input order, from worker processes when there are enough files"""
+    if ANALYSIS_WORKERS <= 1 or len(file_paths) < PARALLEL_ANALYSIS_MIN_FILES:
+        for file_path in file_paths:
+            yield _analyze_file(file_path, clone_path, analysis_depth)
+        return
+    
+    done = 0
     try:
-        lines = content.lower().split('\n')
-        for i, line in enumerate(lines, 1):
-            if search_term in line:
-                return i
-        return 1
-    except:
-        return 1
+        executor = _get_analysis_pool()
+        for file_issues in executor.map(_analyze_file, file_paths, itertools.repeat(clone_path),
+                                        itertools.repeat(analysis_depth), chunksize=ANALYSIS_CHUNK_SIZE):
+            yield file_issues
+            done += 1
+    except Exception as e:
+        logger.warning(f"Parallel analysis failed, analyzing remaining files in-process: {e}")
+        shutdown_analysis_pool()
+        for file_path in file_paths[done:]:
+            yield _analyze_file(file_path, clone_path, analysis_depth)
 
 
-def _perform_detailed_analysis(content: str, file_path: str, compliance_issues: list):
-    """Perform detailed analysis checks"""
+def _get_analysis_pool() -> ProcessPoolExecutor:
+    """
+    Worker processes shared by all analyses
+    
+    Workers stay alive between requests, so the term databases and automata
+    each one builds when importing this module are compiled once per worker.
+    """
+    global _analysis_pool
+    with _analysis_pool_lock:
+        if _analysis_pool is None:
+            _analysis_pool = ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS, mp_context=ANALYSIS_POOL_CONTEXT)
+        return _analysis_pool
+
+
+def shutdown_analysis_pool():
+    """Shut down the analysis worker processes, if any were started"""
+    global _analysis_pool
+    with _analysis_pool_lock:
+        pool, _analysis_pool = _analysis_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _analyze_file(file_path: str, clone_path: str, analysis_depth: str) -> List[dict]:
+    """Compliance issues of a single file (runs in analysis worker processes)"""
+    compliance_issues = []
+    rel_path = os.path.relpath(file_path, clone_path)
+    check_depth = analysis_depth if analysis_depth in ("detailed", "full") else "basic"
+    
+    # Check for potential security issues
     try:
-        content_lower = content.lower()
+        content = _read_source(file_path)
+        
+        # Only the terms this depth can report are looked for; without an '=' no
+        # secret check can fire, so a basic scan of such a file does no search at all
+        has_assignment = (b'=' if isinstance(content, bytes) else '=') in content
+        term_lines = _find_term_lines(content, _DEPTH_TERMS[(check_depth, has_assignment)])
+        
+        # Basic security checks
+        if 'password' in term_lines and has_assignment:
+            line_num = term_lines['password']
+            compliance_issues.append({
+                "file": rel_path,
+                "issue": "Potential hardcoded password",
+                "severity": "high",
+                "line": line_num,
+                "description": "Found potential hardcoded password in source code",
+                "entropy": assigned_value_entropy(_line_text(content, line_num))
+            })
+            
+        if 'api_key' in term_lines and has_assignment:
+            line_num = term_lines['api_key']
+            compliance_issues.append({
+                "file": rel_path,
+                "issue": "Potential hardcoded API key",
+                "severity": "high",
+                "line": line_num,
+                "description": "Found potential hardcoded API key in source code",
+                "entropy": assigned_value_entropy(_line_text(content, line_num))
+            })
+        
+        # Additional checks for detailed and full analysis
+        if analysis_depth in ["detailed", "full"]:
+            _perform_detailed_analysis(content, rel_path, compliance_issues, term_lines, has_assignment)
+        
+        if analysis_depth == "full":
+            _perform_full_analysis(rel_path, compliance_issues, term_lines)
+            
+    except Exception as file_error:
+        logger.warning(f"Could not analyze file {rel_path}: {file_error}")
+    
+    return compliance_issues
+
+
+def _read_source(file_path: str) -> Union[bytes, str]:
+    """
+    Read a source file for analysis
+    
+    Returns:
+        The raw bytes if they are ASCII with no line ending that text mode would
+        translate to a different line count, so no decoding is needed; otherwise
+        the text as read in text mode (UTF-8, undecodable bytes ignored)
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    if data.isascii() and data.count(b'\r') == data.count(b'\r\n'):
+        return data
+    return io.TextIOWrapper(io.BytesIO(data), encoding='utf-8', errors='ignore').read()
+
+
+def _find_term_lines(content: Union[bytes, str], terms: Tuple[str, ...] = ANALYSIS_TERMS) -> Dict[str, int]:
+    """
+    Find the line of the first (case-insensitive) occurrence of each of terms
+    
+    ASCII content is scanned once by the Hyperscan database for all terms;
+    otherwise the lowercased content gets one Aho-Corasick pass, or is searched
+    term by term when pyahocorasick is missing too.
+    
+    Args:
+        content: File text, or its ASCII bytes from _read_source
+        terms: Lowercase terms to look for
+    
+    Returns:
+        1-based line number per term found in content
+    """
+    if not terms:
+        return {}
+    
+    is_bytes = isinstance(content, bytes)
+    database = _build_term_database(terms)
+    if database is not None and (is_bytes or content.isascii()):
+        first_ends = {}
+        
+        def on_match(term_id, start, end, flags, context):
+            first_ends.setdefault(term_id, end)
         
+        try:
+            database.scan(content if is_bytes else content.encode('ascii'), match_event_handler=on_match)
+            newline = b'\n' if is_bytes else '\n'
+            return {
+                terms[term_id]: content.count(newline, 0, end - len(terms[term_id])) + 1
+                for term_id, end in first_ends.items()
+            }
+        except Exception as e:
+            logger.debug(f"Hyperscan scan failed, using str.find: {e}")
+    
+    if is_bytes:
+        content = content.decode('ascii')
+    content_lower = content.lower()
+    term_lines = {}
+    automaton = _build_term_automaton(terms)
+    if automaton is not None:
+        for end_index, term in automaton.iter(content_lower):
+            if term not in term_lines:
+                term_lines[term] = content_lower.count('\n', 0, end_index - len(term) + 1) + 1
+        return term_lines
+    
+    for term in terms:
+        index = content_lower.find(term)
+        if index != -1:
+            term_lines[term] = content_lower.count('\n', 0, index) + 1
+    return term_lines
+
+
+def _line_text(content: Union[bytes, str], line_num: int) -> Union[bytes, str]:
+    """Text of a 1-based line of content, without its newline"""
+    newline = b'\n' if isinstance(content, bytes) else '\n'
+    start = 0
+    for _ in range(line_num - 1):
+        start = content.index(newline, start) + 1
+    end = content.find(newline, start)
+    return content[start:end if end != -1 else len(content)]
+
+
+def _perform_detailed_analysis(content: Union[bytes, str], file_path: str, compliance_issues: list,
+                               term_lines: Dict[str, int], has_assignment: bool):
+    """Perform detailed analysis checks"""
+    try:
         # Check for hardcoded secrets
-        secret_patterns = ['secret', 'token', 'private_key', 'access_token']
-        for pattern in secret_patterns:
-            if pattern in content_lower and '=' in content:
-                line_num = _find_line_number(content, pattern)
+        for pattern, issue, description in _DETAILED_SECRET_CHECKS:
+            if pattern in term_lines and has_assignment:
+                line_num = term_lines[pattern]
                 compliance_issues.append({
                     "file": file_path,
-                    "issue": f"Potential hardcoded {pattern.replace('_', ' ')}",
+                    "issue": issue,
                     "severity": "high",
                     "line": line_num,
-                    "description": f"Found potential hardcoded {pattern.replace('_', ' ')} in source code"
+                    "description": description,
+                    "entropy": assigned_value_entropy(_line_text(content, line_num))
                 })
         
         # Check for TODO/FIXME comments
-        if 'todo' in content_lower or 'fixme' in content_lower:
-            line_num = _find_line_number(content, 'todo' if 'todo' in content_lower else 'fixme')
+        if 'todo' in term_lines or 'fixme' in term_lines:
+            line_num = term_lines.get('todo', term_lines.get('fixme'))
             compliance_issues.append({
                 "file": file_path,
                 "issue": "Code contains TODO/FIXME comments",
@@ -202,27 +492,24 @@ def _perform_detailed_analysis(content: str, file_path: str, compliance_issues:
         logger.warning(f"Detailed analysis failed for {file_path}: {e}")
 
 
-def _perform_full_analysis(content: str, file_path: str, compliance_issues: list):
+def _perform_full_analysis(file_path: str, compliance_issues: list, term_lines: Dict[str, int]):
     """Perform full analysis checks"""
     try:
-        content_lower = content.lower()
-        
         # Check for potential SQL injection patterns
-        sql_patterns = ['select * from', 'drop table', 'delete from']
-        for pattern in sql_patterns:
-            if pattern in content_lower:
-                line_num = _find_line_number(content, pattern)
+        for pattern, description in _SQL_CHECKS:
+            if pattern in term_lines:
+                line_num = term_lines[pattern]
                 compliance_issues.append({
                     "file": file_path,
                     "issue": "Potential SQL injection vulnerability",
                     "severity": "medium",
                     "line": line_num,
-                    "description": f"Found potential SQL injection pattern: {pattern}"
+                    "description": description
                 })
         
         # Check for hardcoded URLs
-        if 'http://' in content_lower:
-            line_num = _find_line_number(content, 'http://')
+        if 'http://' in term_lines:
+            line_num = term_lines['http://']
             compliance_issues.append({
                 "file": file_path,
                 "issue": "Insecure HTTP URL found",
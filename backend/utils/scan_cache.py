@@ -0,0 +1,150 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# SQLite file holding scan results across restarts, and how many results are also kept in memory
+SCAN_CACHE_PATH = os.getenv(
+    "DEVSECOPS_SCAN_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "devsecops-compliance", "scan_cache.sqlite")
+)
+SCAN_CACHE_MEMORY_SIZE = int(os.getenv("DEVSECOPS_SCAN_CACHE_SIZE", "256"))
+
+# Bump when analyze_repository_files reports differently so stored results are not reused
+SCAN_CACHE_VERSION = 1
+
+
+class ScanCache:
+    """
+    Scan results keyed by repository URL, commit SHA and analysis depth
+
+    A commit's content never changes, so a result stays valid for as long as the
+    analysis itself does. Recent results are served from an in-memory LRU; all of
+    them are stored in SQLite.
+    """
+
+    def __init__(self, path: Optional[str] = SCAN_CACHE_PATH, memory_size: int = SCAN_CACHE_MEMORY_SIZE):
+        """
+        Initialize the scan cache; the database file is only created on first use
+
+        Args:
+            path: SQLite database file, or None to keep results in memory only
+            memory_size: Number of results kept in the in-memory LRU
+        """
+        self.path = path
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_opened = path is None
+
+    def _database(self) -> Optional[sqlite3.Connection]:
+        """The SQLite connection, opened (creating the file) on first call; None if unavailable (lock held)"""
+        if not self._db_opened:
+            self._db_opened = True
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._db = sqlite3.connect(self.path, check_same_thread=False)
+                with self._db:
+                    self._db.execute("CREATE TABLE IF NOT EXISTS scan_cache (key TEXT PRIMARY KEY, payload BLOB)")
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Scan cache database unavailable, caching in memory only: {e}")
+                self._db = None
+        return self._db
+
+    @staticmethod
+    def key(repo_url: str, commit_sha: str, analysis_depth: str) -> str:
+        """Cache key of a scan of repo_url at commit_sha"""
+        return f"{ScanCache._repository_prefix(repo_url)}{commit_sha}|{analysis_depth}"
+
+    @staticmethod
+    def _repository_prefix(repo_url: str) -> str:
+        """Leading part shared by the keys of every scan of repo_url"""
+        return f"v{SCAN_CACHE_VERSION}|{repo_url}@"
+
+    def has_repository(self, repo_url: str) -> bool:
+        """
+        Whether any scan of repo_url is cached
+
+        Lets callers skip resolving the remote's commit (a network round trip)
+        for repositories that have never been scanned.
+        """
+        prefix = self._repository_prefix(repo_url)
+        with self._lock:
+            if any(key.startswith(prefix) for key in self._memory):
+                return True
+            db = self._database()
+            if db is None:
+                return False
+            try:
+                # Range scan over the primary key index: every key starting with prefix
+                row = db.execute(
+                    "SELECT 1 FROM scan_cache WHERE key >= ? AND key < ? LIMIT 1", (prefix, prefix + "\uffff")
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Scan cache lookup failed: {e}")
+                return False
+        return row is not None
+
+    def get(self, repo_url: str, commit_sha: str, analysis_depth: str) -> Optional[Dict[str, Any]]:
+        """Cached scan result, or None on a miss"""
+        key = self.key(repo_url, commit_sha, analysis_depth)
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+            elif self._database() is not None:
+                try:
+                    row = self._db.execute("SELECT payload FROM scan_cache WHERE key = ?", (key,)).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"Scan cache lookup failed: {e}")
+                    row = None
+                if row is not None:
+                    payload = row[0]
+                    self._remember(key, payload)
+
+        if payload is None:
+            return None
+        # Stored serialized so every hit hands out an independent copy
+        return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+
+    def put(self, repo_url: str, commit_sha: str, analysis_depth: str, result: Dict[str, Any]):
+        """Store the result of a scan of repo_url at commit_sha"""
+        key = self.key(repo_url, commit_sha, analysis_depth)
+        payload = orjson.dumps(result) if ORJSON_AVAILABLE else json.dumps(result).encode('utf-8')
+        with self._lock:
+            self._remember(key, payload)
+            if self._database() is not None:
+                try:
+                    with self._db:
+                        self._db.execute(
+                            "INSERT OR REPLACE INTO scan_cache (key, payload) VALUES (?, ?)", (key, payload)
+                        )
+                except sqlite3.Error as e:
+                    logger.warning(f"Scan cache write failed: {e}")
+
+    def _remember(self, key: str, payload: bytes):
+        """Add a payload to the in-memory LRU (lock held)"""
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def close(self):
+        """Close the SQLite connection"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+            self._db_opened = self.path is None